@@ -0,0 +1,86 @@
+"""Microbenchmark for utils.targets.classify_targets.
+
+    python3 -m benchmarks.classify_targets [--sizes 1000 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from utils.targets import classify_target, classify_targets
+
+
+def _legacy_is_valid_url(url):
+    # Pre-utils.targets behaviour: the pattern was compiled on every call.
+    regex = re.compile(
+        r"^(?:http|ftp|wss)s?://"
+        r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,20}\.?|[A-Z0-9-]{2,}\.?)|"
+        r"localhost|"
+        r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|"
+        r"\[?[A-F0-9]*:[A-F0-9:]+\]?)"
+        r"(?::\d+)?"
+        r"(?:/?|[/?]\S+)$",
+        re.IGNORECASE,
+    )
+    return re.match(regex, url) is not None
+
+
+def _legacy_classify(targets):
+    wildcards, invalid_urls, valid_urls = [], [], []
+    for target in targets:
+        target = target.strip()
+        if not target:
+            continue
+        if "*" in target:
+            wildcards.append(target)
+        elif not _legacy_is_valid_url(target):
+            invalid_urls.append(target)
+        else:
+            valid_urls.append(target)
+    return wildcards, valid_urls, invalid_urls
+
+
+def synthetic_targets(count, seed=0):
+    rng = random.Random(seed)
+    shapes = (
+        "https://{host}/",
+        "https://api.{host}/v1/{path}",
+        "*.{host}",
+        "{host}",
+        "http://{host}:8080",
+        "{host} (mobile app)",
+    )
+    targets = []
+    for index in range(count):
+        host = f"svc{index}.example{rng.randrange(1000)}.com"
+        targets.append(rng.choice(shapes).format(host=host, path=rng.randrange(100)))
+    return targets
+
+
+def _best_of(repeat, func, targets):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(targets)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark target classification.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'targets':>10} {'legacy s':>10} {'per-item s':>11} {'batch s':>10} {'batch ns/target':>16}")
+    for size in args.sizes:
+        targets = synthetic_targets(size)
+        legacy = _best_of(args.repeat, _legacy_classify, targets)
+        single = _best_of(args.repeat, lambda items: [classify_target(item) for item in items], targets)
+        batch = _best_of(args.repeat, classify_targets, targets)
+        print(f"{size:>10} {legacy:>10.4f} {single:>11.4f} {batch:>10.4f} {batch / size * 1e9:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
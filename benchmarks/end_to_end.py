@@ -0,0 +1,130 @@
+"""End-to-end benchmark: main.main against the local platform stand-in.
+
+    python3 -m benchmarks.end_to_end [--sizes 100 1000 10000] [--concurrency 8] [--latency 0.005] [--error-rate 0]
+
+Each size is a number of synthetic programs, split evenly between Bugcrowd, HackerOne and YesWeHack. Every
+run happens in a fresh subprocess and working directory (no cache, state or snapshots carried
+over), so peak RSS is that of one run. Requests/sec counts what the stand-in served.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.standin import PlatformStandIn
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    # ru_maxrss is in KB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_child(argv):
+    """Run main.main with argv inside this (sub)process and print its wall time and peak RSS as JSON."""
+    import main
+
+    sys.argv = ["main.py", *argv]
+    started = time.perf_counter()
+    main.main()
+    wall = time.perf_counter() - started
+    print("BENCHMARK_RESULT " + json.dumps({"wall_seconds": wall, "peak_rss_mb": _peak_rss_mb()}))
+
+
+def run_size(size, args):
+    bc_programs = h1_programs = size // 3
+    with PlatformStandIn(
+        bc_programs=bc_programs,
+        h1_programs=h1_programs,
+        ywh_programs=size - bc_programs - h1_programs,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        fixtures_dir=args.fixtures,
+    ) as standin, tempfile.TemporaryDirectory(prefix="bbp-bench-") as workdir:
+        env = {
+            **os.environ,
+            "PYTHONPATH": REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+            "SCRAPER_REPLAY_URL": standin.url,
+            "BC_TOKEN": "benchmark",
+            "H1_TOKEN": "benchmark",
+            "YWH_TOKEN": "benchmark",
+        }
+        argv = [
+            "--bc",
+            "--h1",
+            "--ywh",
+            "--dotenv",
+            os.path.join(workdir, ".env"),
+            "--no-cache",
+            "--concurrency",
+            str(args.concurrency),
+            "--rate-limit",
+            "1000000",  # the stand-in is local; don't let the platforms' default 10/s dominate
+        ]
+        command = [sys.executable, "-m", "benchmarks.end_to_end", "--child", "--", *argv]
+        completed = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+
+        if completed.returncode != 0:
+            sys.stderr.write(completed.stdout[-2000:] + completed.stderr[-4000:])
+            raise SystemExit(f"Benchmark run for {size} programs failed with exit code {completed.returncode}")
+
+        result = None
+        for line in completed.stdout.splitlines():
+            if line.startswith("BENCHMARK_RESULT "):
+                result = json.loads(line.split(" ", 1)[1])
+
+        if args.verbose:
+            print(completed.stdout)
+
+        result["programs"] = size
+        result["requests"] = standin.request_count
+        result["injected_errors"] = standin.error_count
+        result["requests_per_second"] = standin.request_count / result["wall_seconds"]
+        return result
+
+
+def main():
+    if "--child" in sys.argv:
+        run_child(sys.argv[sys.argv.index("--") + 1 :])
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark a full scraper run against the local stand-in.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005, help="Seconds added to every stand-in response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of stand-in responses that are 503")
+    parser.add_argument("--fixtures", help="Also replay responses recorded with SCRAPER_RECORD_DIR")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Print the scraper's own output")
+    args = parser.parse_args()
+
+    print(f"{'programs':>9} {'wall s':>9} {'requests':>9} {'req/s':>9} {'errors':>7} {'peak RSS MB':>12}")
+    results = []
+    for size in args.sizes:
+        result = run_size(size, args)
+        results.append(result)
+        peak = f"{result['peak_rss_mb']:.1f}" if result["peak_rss_mb"] is not None else "n/a"
+        print(
+            f"{size:>9} {result['wall_seconds']:>9.2f} {result['requests']:>9} "
+            f"{result['requests_per_second']:>9.1f} {result['injected_errors']:>7} {peak:>12}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
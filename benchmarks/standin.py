@@ -0,0 +1,312 @@
+"""Local stand-in for bugcrowd.com, hackerone.com and api.yeswehack.com, for offline replay and benchmarks.
+
+Clients reach it through platforms.replay.ReplayAdapter (SCRAPER_REPLAY_URL=http://127.0.0.1:PORT),
+which turns https://bugcrowd.com/engagements.json into /bugcrowd.com/engagements.json. Responses come
+from recorded fixtures (SCRAPER_RECORD_DIR) when one matches, else from synthetic programs.
+
+    python3 -m benchmarks.standin --programs 1000 [--port 8765] [--latency 0.01] [--error-rate 0.01] [--fixtures DIR]
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from platforms.replay import fixture_key, load_fixtures
+
+BC_PAGE_SIZE = 24
+YWH_PAGE_SIZE = 50
+BASE_DATE = datetime(2026, 1, 1)
+CHANGELOG_RE = re.compile(r"^/engagements/(bc-[\w-]+)/+changelog/([\w-]+)\.json$")
+ENGAGEMENT_RE = re.compile(r"^/engagements/(bc-[\w-]+)$")
+YWH_PROGRAM_RE = re.compile(r"^/programs/(ywh-[\w-]+)$")
+
+
+def _launched_at(index):
+    # Program 0 is the newest; one launch every 6 hours going back.
+    return BASE_DATE - timedelta(hours=6 * index)
+
+
+class SyntheticPlatforms:
+    """Deterministic Bugcrowd engagements, HackerOne opportunities and YesWeHack programs with a few scope assets each."""
+
+    def __init__(self, bc_programs, h1_programs, ywh_programs=0):
+        self.bc_programs = bc_programs
+        self.h1_programs = h1_programs
+        self.ywh_programs = ywh_programs
+
+    def bc_listing(self, page):
+        start = (page - 1) * BC_PAGE_SIZE
+        engagements = [
+            {
+                "name": f"Bugcrowd program {index}",
+                "code": f"bc-{index}",
+                "briefUrl": f"/engagements/bc-{index}",
+                "launchedAt": _launched_at(index).isoformat() + "Z",
+            }
+            for index in range(start, min(self.bc_programs, start + BC_PAGE_SIZE))
+        ]
+        return {"engagements": engagements}
+
+    def bc_engagement_html(self, code):
+        return f'<html><body><div data-react-class="Brief" data-api="/changelog/{code}-v1&amp;x=1"></div></body></html>'
+
+    def bc_changelog(self, code):
+        host = f"{code}.example.com"
+        targets = [
+            {"name": f"*.{host}", "uri": None, "category": "website"},
+            {"name": f"www.{host}", "uri": f"https://www.{host}/", "category": "website"},
+            {"name": "API", "uri": f"https://api.{host}/v1", "category": "api"},
+            {"name": f"{code} mobile app", "uri": None, "category": "website"},
+            {"name": f"com.{code}.android", "uri": None, "category": "android"},
+        ]
+        return {"data": {"scope": [{"targets": targets}]}}
+
+    def h1_opportunities(self, offset, size):
+        nodes = [
+            {
+                "id": str(index),
+                "handle": f"h1-{index}",
+                "launched_at": _launched_at(index).isoformat() + "Z",
+                "last_updated_at": _launched_at(index).isoformat() + "Z",
+                "structured_scope_stats": {"URL": 2, "WILDCARD": 2, "OTHER": 1},
+                "__typename": "OpportunityDocument",
+            }
+            for index in range(offset, min(self.h1_programs, offset + size))
+        ]
+        return {"data": {"opportunities_search": {"nodes": nodes, "__typename": "SearchResult"}}}
+
+    def h1_scopes(self, handle, offset, size):
+        host = f"{handle}.example.com"
+        scopes = [
+            {"identifier": f"*.{host}", "display_name": "Wildcard"},
+            {"identifier": host, "display_name": "Domain"},
+            {"identifier": f"https://app.{host}", "display_name": "Url"},
+            {"identifier": f"*.cdn.{host}", "display_name": "Url"},
+            {"identifier": f"com.{handle}.ios", "display_name": "AppleStore"},
+        ]
+        nodes = [{**scope, "__typename": "StructuredScopeDocument"} for scope in scopes[offset : offset + size]]
+        return {"data": {"team": {"id": handle, "structured_scopes_search": {"nodes": nodes}}}}
+
+    def ywh_listing(self, page, per_page):
+        start = (page - 1) * per_page
+        items = [
+            {
+                "slug": f"ywh-{index}",
+                "title": f"YesWeHack program {index}",
+                "public": True,
+                "disabled": False,
+                "bounty": index % 10 != 9,  # every tenth program is a VDP
+                "start_date": _launched_at(index).isoformat() + "+00:00",
+            }
+            for index in range(start, min(self.ywh_programs, start + per_page))
+        ]
+        pages = -(-self.ywh_programs // per_page)
+        pagination = {"page": page, "nb_pages": pages, "results_per_page": per_page, "nb_results": self.ywh_programs}
+        return {"items": items, "pagination": pagination}
+
+    def ywh_program(self, slug):
+        host = f"{slug}.example.com"
+        scopes = [
+            {"scope": f"*.{host}", "scope_type": "web-application"},
+            {"scope": f"https://www.{host}", "scope_type": "web-application"},
+            {"scope": f"api.{host}", "scope_type": "api"},
+            {"scope": f"{slug} Android app", "scope_type": "mobile-application-android"},
+            {"scope": "192.0.2.0/24", "scope_type": "ip-address"},
+        ]
+        return {"slug": slug, "title": f"YesWeHack program {slug[4:]}", "scopes": scopes}
+
+
+class PlatformStandIn:
+    """Threaded HTTP server answering like the platforms, with injected latency and errors.
+
+    Every request sleeps `latency` plus up to `jitter` seconds; a seeded `error_rate` share of
+    requests answers 503 (Retry-After: 0) so the client's retry path is exercised too.
+    """
+
+    def __init__(
+        self,
+        bc_programs=0,
+        h1_programs=0,
+        ywh_programs=0,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        fixtures_dir=None,
+        host="127.0.0.1",
+        port=0,
+        seed=0,
+    ):
+        self.synthetic = SyntheticPlatforms(bc_programs, h1_programs, ywh_programs)
+        self.fixtures = load_fixtures(fixtures_dir) if fixtures_dir else {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.error_count = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _draw(self):
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+        return delay, failed
+
+    def respond(self, method, path, body):
+        """Return (status, content_type, body_text) for one request."""
+        json_data = json.loads(body) if body else None
+        host, _, rest = path.lstrip("/").partition("/")
+        fixture = self.fixtures.get(fixture_key(method, f"https://{host}/{rest}", json_data))
+        if fixture:
+            return fixture["status"], fixture["content_type"] or "application/json", fixture["body"]
+
+        parts = urlsplit("/" + rest)
+        if host == "bugcrowd.com":
+            return self._respond_bugcrowd(parts.path, parse_qs(parts.query))
+        if host == "hackerone.com" and parts.path == "/graphql" and json_data:
+            return self._respond_hackerone(json_data)
+        if host == "api.yeswehack.com":
+            return self._respond_yeswehack(parts.path, parse_qs(parts.query))
+        return 404, "text/plain", "not found"
+
+    def _respond_bugcrowd(self, path, query):
+        if path == "/engagements.json":
+            page = int(query.get("page", ["1"])[0])
+            return 200, "application/json", json.dumps(self.synthetic.bc_listing(page))
+
+        match = CHANGELOG_RE.match(path)
+        if match:
+            return 200, "application/json", json.dumps(self.synthetic.bc_changelog(match.group(1)))
+
+        match = ENGAGEMENT_RE.match(path)
+        if match:
+            return 200, "text/html", self.synthetic.bc_engagement_html(match.group(1))
+
+        return 404, "text/plain", "not found"
+
+    def _respond_hackerone(self, json_data):
+        variables = json_data.get("variables", {})
+        offset, size = int(variables.get("from") or 0), int(variables.get("size") or 100)
+
+        if json_data.get("operationName") == "DiscoveryQuery":
+            return 200, "application/json", json.dumps(self.synthetic.h1_opportunities(offset, size))
+        if json_data.get("operationName") == "PolicySearchStructuredScopesQuery":
+            return 200, "application/json", json.dumps(self.synthetic.h1_scopes(variables.get("handle", ""), offset, size))
+        return 400, "application/json", json.dumps({"errors": [{"message": "unknown operation"}]})
+
+    def _respond_yeswehack(self, path, query):
+        if path == "/programs":
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("resultsPerPage", [str(YWH_PAGE_SIZE)])[0])
+            return 200, "application/json", json.dumps(self.synthetic.ywh_listing(page, per_page))
+
+        match = YWH_PROGRAM_RE.match(path)
+        if match:
+            return 200, "application/json", json.dumps(self.synthetic.ywh_program(match.group(1)))
+
+        return 404, "application/json", json.dumps({"code": 404, "message": "Not Found"})
+
+    def _handler_class(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real platforms
+
+            def _serve(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                delay, failed = standin._draw()
+                if delay:
+                    time.sleep(delay)
+
+                if failed:
+                    status, content_type, text = 503, "text/plain", "injected error"
+                else:
+                    status, content_type, text = standin.respond(method, self.path, body)
+
+                payload = text.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                if failed:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic or recorded platform responses locally.")
+    parser.add_argument("--programs", type=int, default=100, help="Synthetic programs per platform")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--fixtures", help="Directory of responses recorded with SCRAPER_RECORD_DIR")
+    args = parser.parse_args()
+
+    standin = PlatformStandIn(
+        bc_programs=args.programs,
+        h1_programs=args.programs,
+        ywh_programs=args.programs,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        fixtures_dir=args.fixtures,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Stand-in listening on {standin.url}; run the scraper with SCRAPER_REPLAY_URL={standin.url}")
+    standin.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
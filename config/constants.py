@@ -5,3 +5,27 @@ WILDCARDS_BASENAME = "wildcards.txt"
 DOMAINS_BASENAME = "domains.txt"
 INVALID_URLS_BASENAME = "invalid_urls.txt"
 PROGRAMS_MD_BASENAME = "programs.md"
+ADDED_BASENAME = "added.txt"
+REMOVED_BASENAME = "removed.txt"
+PROGRAMS_JSONL_BASENAME = "programs.jsonl"
+SCOPE_COLUMNAR_STEM = "scope"
+METRICS_BASENAME = "metrics.json"
+COVERED_DOMAINS_BASENAME = "covered_domains.txt"
+APEXES_BASENAME = "apexes.txt"
+APEX_COUNTS_BASENAME = "apex_counts.txt"
+
+CACHE_DIRNAME = "cache"
+SNAPSHOTS_DIRNAME = "snapshots"
+HTTP_CACHE_BASENAME = "http_cache.sqlite3"
+STATE_DIRNAME = "state"
+PROGRAM_STATE_BASENAME = "programs.sqlite3"
+CHECKPOINTS_DIRNAME = "checkpoints"
+
+DEFAULT_CONCURRENCY = 1
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_CACHE_TTL = 12 * 60 * 60  # seconds
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_MEMORY_MB = 256  # dedupe/sort working set before spilling sorted runs to disk
+DEFAULT_STATE_MAX_AGE = 7 * 24 * 60 * 60  # seconds before --incremental re-fetches an unchanged program
+DEFAULT_DAEMON_EVERY = "1h"
@@ -3,6 +3,15 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
+from config.constants import (
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_MEMORY_MB,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_STATE_MAX_AGE,
+)
+
 
 def load_dotenv(dotenv_path: str = ".env") -> dict[str, str]:
     """Load key-value pairs from a local .env file into process env and return them."""
@@ -34,6 +43,23 @@ def load_runtime_config() -> dict:
             "h1": {"token": os.getenv("H1_TOKEN") or os.getenv("H1_COOKIE")},
             "ywh": {"token": os.getenv("YWH_TOKEN") or os.getenv("YWH_PAT")},
         },
+        "client": {
+            "concurrency": int(os.getenv("SCRAPER_CONCURRENCY") or DEFAULT_CONCURRENCY),
+            "pool_size": int(os.getenv("SCRAPER_POOL_SIZE") or DEFAULT_POOL_SIZE),
+            "max_retries": int(os.getenv("SCRAPER_MAX_RETRIES") or DEFAULT_MAX_RETRIES),
+            "rate_limit": float(os.getenv("SCRAPER_RATE_LIMIT") or 0) or None,
+            "cache": os.getenv("SCRAPER_CACHE", "1").strip().lower() not in ("0", "false", "no", "off"),
+            "cache_ttl": float(os.getenv("SCRAPER_CACHE_TTL") or DEFAULT_CACHE_TTL),
+            "incremental": False,
+            "resume": False,
+            "targets_log": os.getenv("SCRAPER_TARGETS_LOG", "1").strip().lower() not in ("0", "false", "no", "off"),
+            "state_max_age": float(os.getenv("SCRAPER_STATE_MAX_AGE") or DEFAULT_STATE_MAX_AGE),
+            "replay_url": os.getenv("SCRAPER_REPLAY_URL") or None,
+            "record_dir": os.getenv("SCRAPER_RECORD_DIR") or None,
+        },
+        "processing": {
+            "max_memory_mb": float(os.getenv("SCRAPER_MAX_MEMORY_MB") or DEFAULT_MAX_MEMORY_MB),
+        },
         "webhooks": {
             "discord": {"general_vps_output": os.getenv("DISCORD_GENERAL_VPS_OUTPUT_WEBHOOK")},
         },
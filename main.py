@@ -1,20 +1,39 @@
 import argparse
+import dataclasses
 import os
 from datetime import datetime, timedelta, timezone
 
 from config.constants import (
+    ADDED_BASENAME,
+    APEXES_BASENAME,
+    APEX_COUNTS_BASENAME,
+    COVERED_DOMAINS_BASENAME,
     DATA_DIR,
+    DEFAULT_DAEMON_EVERY,
+    DEFAULT_MAX_MEMORY_MB,
     DOMAINS_BASENAME,
     INVALID_URLS_BASENAME,
+    METRICS_BASENAME,
+    PROGRAMS_JSONL_BASENAME,
     PROGRAMS_MD_BASENAME,
+    REMOVED_BASENAME,
+    SCOPE_COLUMNAR_STEM,
+    SNAPSHOTS_DIRNAME,
     TARGETS_BASENAME,
     WILDCARDS_BASENAME,
 )
 from config.settings import load_dotenv, load_runtime_config
-from platforms import bugcrowd, hackerone
-from utils import post_digest
-from utils.models import QueryOptions
+from platforms import bugcrowd, hackerone, yeswehack
+from platforms.base import BasePlatformClient, open_response_cache, open_state_store
+from platforms.runner import PlatformJob, run_platforms
+from utils import diff, post_digest
+from utils.export import RecordExporter, columnar_extension
+from utils.io import concatenate_files
+from utils.metrics import PROCESS_METRICS, Metrics, parse_listen_address, serve_prometheus
+from utils.models import ProgramRecord, QueryOptions
+from utils.notify import notify_discord
 from utils.report import write_programs_markdown
+from utils.scheduler import ScheduledJob, Scheduler, parse_duration
 
 
 def ensure_file_exists(file_path):
@@ -28,17 +47,80 @@ def ensure_file_exists(file_path):
             pass
 
 
-def run_post_processing(wildcards_file, domains_file, invalid_urls_file):
-    """Run post-processing only when source files exist."""
-    if os.path.exists(wildcards_file):
-        post_digest.clean_wildcards(wildcards_file, domains_file)
+def ensure_platform_files(client, platform_paths, keys):
+    """Create a platform's output files; targets.txt only when the client writes the audit log."""
+    for key in keys:
+        if key != "targets_file" or client.targets_log:
+            ensure_file_exists(platform_paths[key])
+
+
+def merge_platform_outputs(paths, platforms):
+    """Concatenate each platform's wildcards/domains/invalid URLs into the combined output files."""
+    for key in ("wildcards_file", "domains_file", "invalid_urls_file"):
+        concatenate_files([paths["platforms"][platform][key] for platform in platforms], paths[key])
+
+
+def run_post_processing(
+    wildcards_file,
+    domains_file,
+    invalid_urls_file,
+    backups=True,
+    max_memory_mb=DEFAULT_MAX_MEMORY_MB,
+    covered_file=None,
+    drop_covered=False,
+    apexes_file=None,
+    apex_counts_file=None,
+):
+    """Normalize, classify and dedupe the output files in one pass, only when source files exist."""
+    if any(os.path.exists(path) for path in (wildcards_file, domains_file, invalid_urls_file)):
+        post_digest.digest_outputs(
+            wildcards_file,
+            domains_file,
+            invalid_urls_file,
+            backups=backups,
+            max_memory_mb=max_memory_mb,
+            covered_file=covered_file,
+            drop_covered=drop_covered,
+            apexes_file=apexes_file,
+            apex_counts_file=apex_counts_file,
+        )
+
 
-    if os.path.exists(invalid_urls_file):
-        post_digest.clean_invalid_urls(invalid_urls_file, domains_file)
+def run_diff(paths, program_records, max_memory_mb=DEFAULT_MAX_MEMORY_MB, complete=True):
+    """Diff this run's outputs against the previous snapshot, then make them the new snapshot.
+
+    Returns the per-program changes, or None when there is no previous snapshot to compare with.
+    An incomplete crawl is not diffed: its missing programs would show up as removed, so the previous
+    snapshot is kept and stale added/removed files are deleted.
+    """
+    if not complete:
+        for path in (paths["added_file"], paths["removed_file"]):
+            if os.path.exists(path):
+                os.remove(path)
+        print("Crawl did not finish; skipping scope diff and keeping the previous snapshot.")
+        return None
+
+    snapshot_dir = paths["snapshot_dir"]
+    previous_records = diff.load_snapshot_records(snapshot_dir)
+    changes = None
+
+    if previous_records is not None:
+        added, removed = diff.diff_files(
+            [
+                (os.path.join(snapshot_dir, WILDCARDS_BASENAME), paths["wildcards_file"]),
+                (os.path.join(snapshot_dir, DOMAINS_BASENAME), paths["domains_file"]),
+            ],
+            paths["added_file"],
+            paths["removed_file"],
+            max_memory_mb=max_memory_mb,
+        )
+        changes = diff.diff_records(previous_records, program_records)
+        print(f"Scope diff: {added} added, {removed} removed, {len(changes)} programs changed")
+    else:
+        print("No previous snapshot found; skipping scope diff.")
 
-    if os.path.exists(domains_file):
-        post_digest.add_https_to_domains(domains_file)
-        post_digest.remove_duplicate_domains(domains_file)
+    diff.save_snapshot(snapshot_dir, [paths["wildcards_file"], paths["domains_file"]], program_records)
+    return changes
 
 
 def build_query_options(mode: str, interval: str | None, days: int | None) -> QueryOptions:
@@ -58,20 +140,256 @@ def build_query_options(mode: str, interval: str | None, days: int | None) -> Qu
     return QueryOptions(mode="new", cutoff=cutoff, interval_label="last_week")
 
 
-def build_output_paths(query_options: QueryOptions) -> dict[str, str]:
+def build_output_paths(query_options: QueryOptions, platforms: list[str]) -> dict[str, str]:
     timestamp = datetime.now().strftime("%m-%d-%Y")
     base_dir = os.path.join(DATA_DIR, timestamp, query_options.interval_label)
+    # Snapshots are per interval and platform selection, so an --h1 run never diffs against a --bc run.
+    snapshot_dir = os.path.join(DATA_DIR, SNAPSHOTS_DIRNAME, query_options.interval_label, "_".join(sorted(platforms)))
+
+    # Each platform writes its raw outputs to its own subdirectory; they are merged before post-processing.
+    platform_paths = {
+        platform: {
+            "targets_file": os.path.join(base_dir, platform, TARGETS_BASENAME),
+            "wildcards_file": os.path.join(base_dir, platform, WILDCARDS_BASENAME),
+            "domains_file": os.path.join(base_dir, platform, DOMAINS_BASENAME),
+            "invalid_urls_file": os.path.join(base_dir, platform, INVALID_URLS_BASENAME),
+        }
+        for platform in platforms
+    }
 
     return {
         "base_dir": base_dir,
-        "targets_file": os.path.join(base_dir, TARGETS_BASENAME),
+        "platforms": platform_paths,
         "wildcards_file": os.path.join(base_dir, WILDCARDS_BASENAME),
         "domains_file": os.path.join(base_dir, DOMAINS_BASENAME),
         "invalid_urls_file": os.path.join(base_dir, INVALID_URLS_BASENAME),
+        "covered_domains_file": os.path.join(base_dir, COVERED_DOMAINS_BASENAME),
+        "apexes_file": os.path.join(base_dir, APEXES_BASENAME),
+        "apex_counts_file": os.path.join(base_dir, APEX_COUNTS_BASENAME),
         "programs_md_file": os.path.join(base_dir, PROGRAMS_MD_BASENAME),
+        "programs_jsonl_file": os.path.join(base_dir, PROGRAMS_JSONL_BASENAME),
+        "scope_columnar_file": os.path.join(base_dir, SCOPE_COLUMNAR_STEM + columnar_extension()),
+        "added_file": os.path.join(base_dir, ADDED_BASENAME),
+        "removed_file": os.path.join(base_dir, REMOVED_BASENAME),
+        "metrics_file": os.path.join(base_dir, METRICS_BASENAME),
+        "snapshot_dir": snapshot_dir,
     }
 
 
+def open_clients(config, platforms, cache=None, state=None):
+    """Create one long-lived client per selected platform that has a scraper.
+
+    The platforms crawl concurrently, so they share one cache and one state store (one SQLite
+    connection each) rather than opening competing connections to the same files.
+    """
+    clients = {}
+    if "bc" in platforms:
+        clients["bc"] = bugcrowd.BugcrowdClient(config, cache=cache, state=state)
+    if "h1" in platforms:
+        clients["h1"] = hackerone.HackerOneClient(config, cache=cache, state=state)
+    if "ywh" in platforms:
+        clients["ywh"] = yeswehack.YesWeHackClient(config, cache=cache, state=state)
+    return clients
+
+
+def run_cycle(clients, query_options: QueryOptions, args, max_memory_mb=DEFAULT_MAX_MEMORY_MB):
+    """Crawl with the given clients, then export, merge, post-process, diff and report.
+
+    Returns the program records, the per-program changes since the previous snapshot (or None) and
+    whether every platform's crawl ran to completion. Request and stage metrics of this run are
+    written to metrics.json.
+    """
+    paths = build_output_paths(query_options, list(clients))
+    metrics = Metrics(parent=PROCESS_METRICS)
+    for client in clients.values():
+        client.metrics = metrics
+        client.last_run_complete = False
+    program_records: list[ProgramRecord] = []
+    os.makedirs(paths["base_dir"], exist_ok=True)
+    jobs = []
+    with RecordExporter(paths["programs_jsonl_file"], paths["scope_columnar_file"] if args.columnar else None) as exporter:
+        if "bc" in clients:
+            bc_paths = paths["platforms"]["bc"]
+            ensure_platform_files(clients["bc"], bc_paths, bc_paths)
+            jobs.append(
+                PlatformJob(
+                    "bc",
+                    "Bugcrowd",
+                    lambda: clients["bc"].run(
+                        bc_paths["targets_file"],
+                        bc_paths["wildcards_file"],
+                        bc_paths["domains_file"],
+                        bc_paths["invalid_urls_file"],
+                        query_options,
+                        on_record=exporter.write,
+                    ),
+                )
+            )
+
+        if "h1" in clients:
+            h1_paths = paths["platforms"]["h1"]
+            ensure_platform_files(clients["h1"], h1_paths, ("targets_file", "wildcards_file", "domains_file"))
+            jobs.append(
+                PlatformJob(
+                    "h1",
+                    "HackerOne",
+                    lambda: clients["h1"].run(
+                        h1_paths["targets_file"],
+                        h1_paths["wildcards_file"],
+                        h1_paths["domains_file"],
+                        query_options,
+                        on_record=exporter.write,
+                    ),
+                )
+            )
+
+        if "ywh" in clients:
+            ywh_paths = paths["platforms"]["ywh"]
+            ensure_platform_files(clients["ywh"], ywh_paths, ywh_paths)
+            jobs.append(
+                PlatformJob(
+                    "ywh",
+                    "YesWeHack",
+                    lambda: clients["ywh"].run(
+                        ywh_paths["targets_file"],
+                        ywh_paths["wildcards_file"],
+                        ywh_paths["domains_file"],
+                        ywh_paths["invalid_urls_file"],
+                        query_options,
+                        on_record=exporter.write,
+                    ),
+                )
+            )
+
+        with metrics.stage("crawl"):
+            results = run_platforms(jobs, metrics)
+        for records in results.values():
+            program_records.extend(records or [])
+
+    # A platform that raised, had no credentials or stopped mid-listing leaves a partial crawl.
+    incomplete = [key for key, records in results.items() if records is None or not clients[key].last_run_complete]
+    if incomplete:
+        print(f"Incomplete crawl for: {', '.join(incomplete)}")
+
+    print(f"Exported {exporter.count} programs to {paths['programs_jsonl_file']}")
+
+    print("Processing output files...")
+    with metrics.stage("merge"):
+        merge_platform_outputs(paths, [job.key for job in jobs])
+    with metrics.stage("post_processing"):
+        run_post_processing(
+            paths["wildcards_file"],
+            paths["domains_file"],
+            paths["invalid_urls_file"],
+            backups=not args.no_backups,
+            max_memory_mb=max_memory_mb,
+            covered_file=paths["covered_domains_file"],
+            drop_covered=args.covered == "drop",
+            apexes_file=paths["apexes_file"],
+            apex_counts_file=paths["apex_counts_file"],
+        )
+    with metrics.stage("diff"):
+        changes = run_diff(paths, program_records, max_memory_mb=max_memory_mb, complete=not incomplete)
+
+    ensure_file_exists(paths["programs_md_file"])
+    report_max_bytes = int(args.report_max_mb * 1024 * 1024) if args.report_max_mb else None
+    with metrics.stage("report"):
+        report_paths = write_programs_markdown(
+            program_records, paths["programs_md_file"], changes=changes, max_bytes=report_max_bytes
+        )
+    print(f"Program report written to {', '.join(report_paths)}")
+
+    metrics.write_json(paths["metrics_file"])
+    print(f"Metrics written to {paths['metrics_file']}")
+    return program_records, changes, not incomplete
+
+
+@dataclasses.dataclass
+class Schedule:
+    platform: str
+    mode: str
+    days: int | None
+    interval: str | None
+    every: float
+
+    @property
+    def name(self) -> str:
+        window = f":{self.days}" if self.days else (f":{self.interval}" if self.interval else "")
+        return f"{self.platform}:{self.mode}{window}"
+
+
+def parse_schedule(spec: str) -> Schedule:
+    """Parse PLATFORM:MODE[:DAYS]@EVERY, e.g. h1:new:1@10m or bc:all@1d."""
+    target, _, every = spec.partition("@")
+    parts = target.split(":")
+    if not every or len(parts) not in (2, 3):
+        raise ValueError(f"Invalid --schedule {spec!r}: expected PLATFORM:MODE[:DAYS]@EVERY")
+
+    platform, mode = parts[0], parts[1]
+    if platform not in ("bc", "h1", "ywh"):
+        raise ValueError(f"Invalid --schedule {spec!r}: platform must be bc, h1 or ywh")
+    if mode not in ("all", "new"):
+        raise ValueError(f"Invalid --schedule {spec!r}: mode must be all or new")
+
+    days = None
+    if len(parts) == 3:
+        if mode != "new" or not parts[2].isdigit() or int(parts[2]) <= 0:
+            raise ValueError(f"Invalid --schedule {spec!r}: DAYS must be a positive integer with mode new")
+        days = int(parts[2])
+
+    return Schedule(platform, mode, days, None, parse_duration(every))
+
+
+def default_schedules(args, platforms) -> list[Schedule]:
+    every = parse_duration(DEFAULT_DAEMON_EVERY)
+    return [Schedule(platform, args.mode, args.days, args.interval, every) for platform in platforms]
+
+
+def run_daemon(clients: dict[str, BasePlatformClient], schedules: list[Schedule], args, config, max_memory_mb):
+    """Run each schedule on its platform's warm client until interrupted, announcing new and changed programs."""
+    webhook_url = config.get("webhooks", {}).get("discord", {}).get("general_vps_output")
+    # Per schedule: an h1:new window only ever sees recent programs, so an h1:all schedule sharing its set
+    # would announce every older program as new.
+    seen_programs: dict[str, set[str] | None] = {schedule.name: None for schedule in schedules}
+
+    def make_job(schedule: Schedule) -> ScheduledJob:
+        client = clients[schedule.platform]
+
+        def run():
+            client.reset_auth()
+            query_options = build_query_options(schedule.mode, schedule.interval, schedule.days)
+            # Each schedule gets its own output folder and snapshot, e.g. data/<date>/h1_1_days/.
+            query_options = dataclasses.replace(
+                query_options, interval_label=f"{schedule.platform}_{query_options.interval_label}"
+            )
+            records, changes, complete = run_cycle({schedule.platform: client}, query_options, args, max_memory_mb)
+            if not complete:
+                print(f"[{schedule.name}] crawl did not finish; no announcements this cycle.")
+                return
+
+            names = {record.name for record in records}
+            previous = seen_programs[schedule.name]
+            seen_programs[schedule.name] = names | (previous or set())
+
+            lines = []
+            if previous is not None:
+                lines.extend(f"[{schedule.platform}] new program: {name}" for name in sorted(names - previous))
+            for change in changes or []:
+                if change.status == "changed":
+                    lines.append(
+                        f"[{schedule.platform}] scope changed: {change.name} (+{len(change.added)} / -{len(change.removed)})"
+                    )
+
+            for line in lines:
+                print(line)
+            notify_discord(webhook_url, lines)
+
+        return ScheduledJob(name=schedule.name, group=schedule.platform, interval=schedule.every, run=run)
+
+    print(f"Daemon started with {len(schedules)} schedules: {', '.join(s.name for s in schedules)}")
+    Scheduler([make_job(schedule) for schedule in schedules]).run_forever()
+
+
 def main():
     """Parse command-line arguments and execute the appropriate scripts."""
     parser = argparse.ArgumentParser(description="Run scripts for programs.")
@@ -84,6 +402,47 @@ def main():
     parser.add_argument("--mode", choices=["all", "new"], default="all", help="Query all programs or only newly launched ones")
     parser.add_argument("--interval", choices=["last_week", "last_month"], help="Preset interval for --mode new")
     parser.add_argument("--days", type=int, help="Custom interval in days for --mode new")
+    parser.add_argument("--concurrency", type=int, help="Max concurrent scope fetches per platform (default: 1)")
+    parser.add_argument("--max-retries", type=int, help="Retries for network errors and 429/5xx responses (default: 4)")
+    parser.add_argument("--rate-limit", type=float, help="Max requests per second per host (default: platform-specific)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk HTTP response cache")
+    parser.add_argument("--cache-ttl", type=float, help="Seconds a cached response is reused before revalidation (default: 43200)")
+    parser.add_argument(
+        "--max-memory", type=float, help="MB of memory for dedupe/sort before spilling to disk (default: 256)"
+    )
+    parser.add_argument(
+        "--report-max-mb", type=float, help="Split programs.md into numbered parts once a part exceeds this size"
+    )
+    parser.add_argument(
+        "--columnar", action="store_true", help="Also export one row per asset to scope.parquet (or a pure-Python fallback)"
+    )
+    parser.add_argument("--no-targets-log", action="store_true", help="Do not write the raw targets.txt audit log")
+    parser.add_argument(
+        "--covered",
+        choices=["keep", "drop"],
+        default="keep",
+        help="drop: remove domains already inside a wildcard and nested wildcards (always listed in covered_domains.txt)",
+    )
+    parser.add_argument("--no-backups", action="store_true", help="Skip domain_trash/ backups during post-processing")
+    parser.add_argument(
+        "--resume", action="store_true", help="Continue an interrupted crawl from its checkpoint in data/state/checkpoints/"
+    )
+    parser.add_argument("--daemon", action="store_true", help="Keep running and crawl on a schedule (see --schedule)")
+    parser.add_argument(
+        "--metrics-listen",
+        metavar="[HOST:]PORT",
+        help="With --daemon, serve Prometheus metrics on http://HOST:PORT/metrics (default host 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--schedule",
+        action="append",
+        default=[],
+        metavar="PLATFORM:MODE[:DAYS]@EVERY",
+        help="Daemon job, repeatable, e.g. h1:new:1@10m or bc:all@1d (default: selected platforms, --mode, every 1h)",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true", help="Only re-fetch programs that are new or changed since the last run"
+    )
 
     args = parser.parse_args()
 
@@ -93,65 +452,90 @@ def main():
     if args.mode == "new" and args.days is not None and args.days <= 0:
         parser.error("--days must be a positive integer")
 
+    if args.concurrency is not None and args.concurrency <= 0:
+        parser.error("--concurrency must be a positive integer")
+
+    if args.max_retries is not None and args.max_retries < 0:
+        parser.error("--max-retries must be zero or a positive integer")
+
+    if args.rate_limit is not None and args.rate_limit <= 0:
+        parser.error("--rate-limit must be a positive number")
+
+    if args.max_memory is not None and args.max_memory <= 0:
+        parser.error("--max-memory must be a positive number")
+
+    if args.report_max_mb is not None and args.report_max_mb <= 0:
+        parser.error("--report-max-mb must be a positive number")
+
+    if args.cache_ttl is not None and args.cache_ttl < 0:
+        parser.error("--cache-ttl must be zero or a positive number")
+
     load_dotenv(args.dotenv)
     config = load_runtime_config()
+    if args.concurrency is not None:
+        config["client"]["concurrency"] = args.concurrency
+    if args.max_retries is not None:
+        config["client"]["max_retries"] = args.max_retries
+    if args.rate_limit is not None:
+        config["client"]["rate_limit"] = args.rate_limit
+    if args.no_cache:
+        config["client"]["cache"] = False
+    if args.cache_ttl is not None:
+        config["client"]["cache_ttl"] = args.cache_ttl
+    if args.incremental:
+        config["client"]["incremental"] = True
+    if args.resume:
+        config["client"]["resume"] = True
+    if args.no_targets_log:
+        config["client"]["targets_log"] = False
+    if args.max_memory is not None:
+        config["processing"]["max_memory_mb"] = args.max_memory
+    max_memory_mb = config["processing"]["max_memory_mb"]
     query_options = build_query_options(args.mode, args.interval, args.days)
-    paths = build_output_paths(query_options)
 
-    if not (args.bc or args.h1 or args.ywh):
+    if not (args.bc or args.h1 or args.ywh or args.schedule):
         parser.error("Please select at least one script flag: --bc, --h1, or --ywh")
 
-    if args.check_auth:
-        if args.bc and not bugcrowd.check_auth(config):
-            raise SystemExit(1)
-        if args.h1 and not hackerone.check_auth(config):
-            raise SystemExit(1)
-
-    program_records = []
-
-    if args.bc:
-        print("Running Bugcrowd script...")
-        ensure_file_exists(paths["targets_file"])
-        ensure_file_exists(paths["wildcards_file"])
-        ensure_file_exists(paths["domains_file"])
-        ensure_file_exists(paths["invalid_urls_file"])
-        bc_records = bugcrowd.main(
-            config,
-            paths["targets_file"],
-            paths["wildcards_file"],
-            paths["domains_file"],
-            paths["invalid_urls_file"],
-            query_options=query_options,
-        )
-        if bc_records:
-            program_records.extend(bc_records)
-
-    if args.ywh:
-        print("Running YesWeHack script...")
-        print("YesWeHack scraper not implemented yet. Add logic in platforms/yeswehack.py")
-
-    if args.h1:
-        ensure_file_exists(paths["targets_file"])
-        ensure_file_exists(paths["wildcards_file"])
-        ensure_file_exists(paths["domains_file"])
-
-        print("Running HackerOne script...")
-        h1_records = hackerone.main(
-            config,
-            paths["targets_file"],
-            paths["wildcards_file"],
-            paths["domains_file"],
-            query_options=query_options,
-        )
-        if h1_records:
-            program_records.extend(h1_records)
-
-    print("Processing output files...")
-    run_post_processing(paths["wildcards_file"], paths["domains_file"], paths["invalid_urls_file"])
-
-    ensure_file_exists(paths["programs_md_file"])
-    write_programs_markdown(program_records, paths["programs_md_file"])
-    print(f"Program report written to {paths['programs_md_file']}")
+    selected_platforms = [name for name in ("bc", "h1", "ywh") if getattr(args, name)]
+
+    schedules = []
+    if args.daemon:
+        try:
+            schedules = [parse_schedule(spec) for spec in args.schedule] or default_schedules(args, selected_platforms)
+        except ValueError as exc:
+            parser.error(str(exc))
+        selected_platforms = sorted({schedule.platform for schedule in schedules} | set(selected_platforms))
+    elif args.schedule or args.metrics_listen:
+        parser.error("--schedule/--metrics-listen can only be used with --daemon")
+
+    metrics_address = None
+    if args.metrics_listen:
+        try:
+            metrics_address = parse_listen_address(args.metrics_listen)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    client_options = config.get("client", {})
+    cache, state = open_response_cache(client_options), open_state_store(client_options)
+    clients = open_clients(config, selected_platforms, cache=cache, state=state)
+    try:
+        if args.check_auth:
+            for client in clients.values():
+                if not client.check_auth():
+                    raise SystemExit(1)
+
+        if args.daemon:
+            if metrics_address:
+                serve_prometheus(*metrics_address)
+            run_daemon(clients, schedules, args, config, max_memory_mb)
+        else:
+            run_cycle(clients, query_options, args, max_memory_mb)
+    finally:
+        for client in clients.values():
+            client.close()
+        for store in (cache, state):
+            if store:
+                store.close()
 
 
 if __name__ == "__main__":
@@ -1,27 +1,421 @@
 from __future__ import annotations
 
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TypeVar
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from config.constants import (
+    CACHE_DIRNAME,
+    CHECKPOINTS_DIRNAME,
+    DATA_DIR,
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_STATE_MAX_AGE,
+    HTTP_CACHE_BASENAME,
+    PROGRAM_STATE_BASENAME,
+    STATE_DIRNAME,
+)
+from platforms.cache import ResponseCache
+from platforms.checkpoint import CrawlCheckpoint
+from platforms.ratelimit import RateLimiter
+from platforms.replay import FixtureRecorder, ReplayAdapter
+from platforms.retry import RETRY_STATUSES, THROTTLE_STATUSES, RetryPolicy, parse_retry_after
+from platforms.state import ProgramState, ProgramStateStore
+from utils.metrics import PROCESS_METRICS
+from utils.models import ProgramRecord, QueryOptions
+from utils.targets import WILDCARD, TargetSink
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 class AuthenticationError(RuntimeError):
     """Raised when platform authentication fails."""
 
 
+class CrawlInterrupted(RuntimeError):
+    """Raised when a listing cannot be walked to its end, so the crawl's checkpoint must be kept."""
+
+
+def open_response_cache(client_options: dict) -> ResponseCache | None:
+    """The HTTP cache described by the "client" config section, or None when caching is off."""
+    if not client_options.get("cache", True):
+        return None
+
+    ttl = client_options.get("cache_ttl")
+    return ResponseCache(
+        client_options.get("cache_path") or os.path.join(DATA_DIR, CACHE_DIRNAME, HTTP_CACHE_BASENAME),
+        ttl=DEFAULT_CACHE_TTL if ttl is None else float(ttl),
+        max_bytes=int(client_options.get("cache_max_bytes") or DEFAULT_CACHE_MAX_BYTES),
+    )
+
+
+def open_state_store(client_options: dict) -> ProgramStateStore | None:
+    """The program state store described by the "client" config section, or None when it is off."""
+    if not client_options.get("state", True):
+        return None
+
+    max_age = client_options.get("state_max_age")
+    return ProgramStateStore(
+        client_options.get("state_path") or os.path.join(DATA_DIR, STATE_DIRNAME, PROGRAM_STATE_BASENAME),
+        max_age=DEFAULT_STATE_MAX_AGE if max_age is None else float(max_age),
+    )
+
+
 class BasePlatformClient:
     platform_label = "Platform"
+    platform_id = "platform"  # ProgramRecord.platform and program-state namespace
+    default_rate_limit: float | None = None  # requests per second per host, None = unlimited
+    default_headers: dict[str, str] = {}
+    stored_domain_kind: str | None = None  # kind stored domains are re-added to a sink with; None re-classifies them
+    audit_program_names = False  # audit log gets program names (e.g. H1 handles) instead of raw targets
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, cache: ResponseCache | None = None, state: ProgramStateStore | None = None):
+        """cache and state are shared stores (see main.open_clients); their owner closes them, not this client."""
         self.config = config
+        self.metrics = PROCESS_METRICS  # run_cycle swaps in a per-run registry
+        self._auth_failed = threading.Event()
+        self.rate_limiter = RateLimiter(self.rate_limit)
+        self.retry_policy = RetryPolicy(max_retries=self.max_retries)
+        self.session = self._build_session()
+        self.recorder = self._build_recorder()
+        self._owns_cache = cache is None
+        self._owns_state = state is None
+        self.cache = cache if cache is not None else open_response_cache(self.client_options)
+        self.state = state if state is not None else open_state_store(self.client_options)
+        self.last_run_complete = False
 
-    def request(self, url: str, headers: dict, method: str = "GET", json_data: dict | None = None) -> requests.Response:
-        try:
-            response = requests.request(method=method, url=url, headers=headers, json=json_data, timeout=30)
-        except requests.RequestException as exc:
-            raise RuntimeError(f"Network error while requesting {url}: {exc}") from exc
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+        if self.cache and self._owns_cache:
+            self.cache.close()
+        if self.state and self._owns_state:
+            self.state.close()
+
+    def reset_auth(self) -> None:
+        """Allow requests again after an AuthenticationError, e.g. before the next scheduled crawl."""
+        self._auth_failed.clear()
+
+    def _build_session(self) -> requests.Session:
+        """Create a keep-alive session whose connection pool fits the configured concurrency."""
+        session = requests.Session()
+        replay_url = self.client_options.get("replay_url")
+        if replay_url:
+            adapter = ReplayAdapter(replay_url, pool_connections=4, pool_maxsize=self.pool_size)
+        else:
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(self.default_headers)
+        return session
+
+    def _build_recorder(self) -> FixtureRecorder | None:
+        record_dir = self.client_options.get("record_dir")
+        return FixtureRecorder(record_dir) if record_dir else None
+
+    @property
+    def client_options(self) -> dict:
+        return self.config.get("client", {})
+
+    @property
+    def concurrency(self) -> int:
+        return max(1, int(self.client_options.get("concurrency") or DEFAULT_CONCURRENCY))
+
+    @property
+    def pool_size(self) -> int:
+        return max(self.concurrency + 1, int(self.client_options.get("pool_size") or DEFAULT_POOL_SIZE))
+
+    @property
+    def max_retries(self) -> int:
+        value = self.client_options.get("max_retries")
+        return DEFAULT_MAX_RETRIES if value is None else max(0, int(value))
+
+    @property
+    def rate_limit(self) -> float | None:
+        return self.client_options.get("rate_limit") or self.default_rate_limit
+
+    @property
+    def targets_log(self) -> bool:
+        """Whether raw discovered targets are also written to targets.txt as an audit log."""
+        return bool(self.client_options.get("targets_log", True))
+
+    @property
+    def incremental(self) -> bool:
+        return bool(self.client_options.get("incremental")) and self.state is not None
+
+    def open_checkpoint(self, query_options: QueryOptions) -> CrawlCheckpoint:
+        """Checkpoint of this platform's crawl for query_options; with the resume option, earlier progress is loaded."""
+        options = self.client_options
+        directory = options.get("checkpoint_dir") or os.path.join(DATA_DIR, STATE_DIRNAME, CHECKPOINTS_DIRNAME)
+        path = os.path.join(directory, f"{self.platform_id}_{query_options.interval_label}.jsonl")
+        return CrawlCheckpoint(path, self.platform_id, query_options, resume=bool(options.get("resume")))
+
+    def reusable_state(self, key: str, listing_hash: str) -> ProgramState | None:
+        """In incremental mode, return the stored program when its listing entry is unchanged and not too old."""
+        if not self.incremental:
+            return None
+
+        state = self.state.get(self.platform_id, key)
+        if state is None or state.listing_hash != listing_hash or not self.state.is_current(state):
+            return None
+
+        self.state.mark_seen(self.platform_id, key)
+        return state
+
+    def record_state(self, key: str, listing_hash: str, record: ProgramRecord) -> None:
+        """Merge a freshly fetched program into the state store, reporting scope changes."""
+        if not self.state:
+            return
+
+        previous = self.state.get(self.platform_id, key)
+        scope_hash = self.state.put(
+            self.platform_id, key, record.name, record.launched_at, listing_hash, record.wildcards, record.domains
+        )
+        if previous and previous.scope_hash != scope_hash:
+            print(f"Scope changed for {self.platform_label} program {record.name}")
+
+    def _stored_targets(self, wildcards: list[str], domains: list[str]) -> list[tuple[str, str | None]]:
+        return [(wildcard, WILDCARD) for wildcard in wildcards] + [(domain, self.stored_domain_kind) for domain in domains]
 
-        if response.status_code in (401, 403):
-            raise AuthenticationError(
-                f"{self.platform_label} authentication failed with status {response.status_code}. Refresh your credentials."
+    def _sink_targets(self, sink: TargetSink, name: str, targets: list[tuple[str, str | None]]) -> list[tuple[str, str | None]]:
+        """Add (target, kind) pairs to sink and return them with the kind each was written as."""
+        if self.audit_program_names:
+            sink.audit(name)
+        added = []
+        for target, kind in targets:
+            if not self.audit_program_names:
+                sink.audit(target)
+            added.append((target, sink.add(target, kind)))
+        return added
+
+    def crawl(
+        self,
+        sink: TargetSink,
+        query_options: QueryOptions,
+        iter_listing: Callable[[QueryOptions, int | None], Iterable[dict]],
+        fetch_scope: Callable[[dict], list[tuple[str, str | None]] | None],
+        on_record: Callable[[ProgramRecord], None] | None = None,
+    ) -> list[ProgramRecord]:
+        """Crawl every listed program into sink and return the records, newest first.
+
+        iter_listing(query_options, position) yields one dict per program, starting at a checkpointed
+        listing position (None for the start), with its "key", "name", "launched_at", "listing_hash"
+        and listing "position". fetch_scope(program) runs on the worker pool and returns the program's
+        (target, kind) pairs, kind None meaning classify, or None to skip the program; it may fill in
+        program["launched_at"]. Programs finished before an interrupted crawl are replayed from the
+        checkpoint, unchanged ones come from the state store with --incremental, and --mode new drops
+        programs launched before the cutoff. last_run_complete tells whether the listing was walked to its end.
+        """
+        self.last_run_complete = False
+        records: list[ProgramRecord] = []
+
+        def emit(record):
+            records.append(record)
+            if on_record:
+                on_record(record)
+
+        def fetch(program):
+            state = self.reusable_state(program["key"], program["listing_hash"])
+            if state:
+                program["launched_at"] = program["launched_at"] or state.launched_at
+                return program, self._stored_targets(state.wildcards, state.domains), False
+            return program, fetch_scope(program), True
+
+        with self.open_checkpoint(query_options) as checkpoint:
+            for record in checkpoint.records:
+                self._sink_targets(sink, record.name, self._stored_targets(record.wildcards, record.domains))
+                emit(record)
+
+            options = checkpoint.query_options
+            programs = (
+                program for program in iter_listing(options, checkpoint.page) if not checkpoint.is_done(program["key"])
             )
+            try:
+                for program, targets, fetched in self.map_concurrent(fetch, programs):
+                    launched_at = program["launched_at"]
+                    too_old = launched_at is None or (options.cutoff and launched_at < options.cutoff)
+                    if targets is None or (options.mode == "new" and too_old):
+                        checkpoint.add(program["key"], program["position"], None)
+                        continue
+
+                    record = ProgramRecord(platform=self.platform_id, name=program["name"], launched_at=launched_at)
+                    for target, kind in self._sink_targets(sink, program["name"], targets):
+                        if kind == WILDCARD:
+                            record.add_wildcard(target)
+                        else:
+                            record.add_domain(target)
+
+                    if fetched:
+                        self.record_state(program["key"], program["listing_hash"], record)
+                    checkpoint.add(program["key"], program["position"], record)
+                    emit(record)
+            except (AuthenticationError, RuntimeError) as exc:
+                print(str(exc))
+            else:
+                checkpoint.complete()
+                self.last_run_complete = True
+            finally:
+                if self.state:
+                    self.state.commit()
 
+        records.sort(key=lambda r: r.launched_at or datetime.min, reverse=True)
+        return records
+
+    def request(
+        self,
+        url: str,
+        headers: dict | None = None,
+        method: str = "GET",
+        json_data: dict | None = None,
+        cache: bool = False,
+    ) -> requests.Response:
+        """Send a request; with cache=True a fresh cached 200 is reused and a stale one is revalidated."""
+        if not (cache and self.cache):
+            return self._send(url, headers, method, json_data)
+
+        key = self.cache.key(method, url, json_data, headers)
+        cached = self.cache.get(key)
+        if cached and self.cache.is_fresh(cached):
+            self.metrics.inc("http_cache_total", platform=self.platform_id, result="hit")
+            return cached.response
+
+        if cached:
+            headers = {**(headers or {}), **cached.validators}
+
+        response = self._send(url, headers, method, json_data)
+        if cached and response.status_code == 304:
+            self.metrics.inc("http_cache_total", platform=self.platform_id, result="revalidated")
+            self.cache.touch(key)
+            return cached.response
+        self.metrics.inc("http_cache_total", platform=self.platform_id, result="miss")
+        if response.status_code == 200:
+            self.cache.put(key, response)
         return response
+
+    def _send(self, url: str, headers: dict | None, method: str, json_data: dict | None) -> requests.Response:
+        """Send a request, retrying network errors and 429/5xx responses with jittered backoff.
+
+        Exhausted network retries raise RuntimeError; an exhausted 429/5xx is returned to the caller.
+        """
+        attempt = 0
+        host = urlsplit(url).netloc
+
+        while True:
+            if self._auth_failed.is_set():
+                raise AuthenticationError(f"{self.platform_label} request to {url} skipped after an earlier authentication failure.")
+
+            self.rate_limiter.wait(url)
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method=method, url=url, headers=headers, json=json_data, timeout=30)
+            except requests.RequestException as exc:
+                self.metrics.inc("http_errors_total", platform=self.platform_id, host=host, error=type(exc).__name__)
+                if attempt >= self.retry_policy.max_retries:
+                    raise RuntimeError(f"Network error while requesting {url}: {exc}") from exc
+                self.metrics.inc("http_retries_total", platform=self.platform_id, host=host, reason="network")
+                delay = self.retry_policy.delay(attempt)
+                print(f"Network error while requesting {url}: {exc}. Retrying in {delay:.1f}s...")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self._record_response(host, method, response, time.perf_counter() - started)
+            if self.recorder:
+                self.recorder.record(method, url, json_data, response)
+
+            if response.status_code in (401, 403):
+                self._auth_failed.set()
+                raise AuthenticationError(
+                    f"{self.platform_label} authentication failed with status {response.status_code}. Refresh your credentials."
+                )
+
+            if response.status_code not in RETRY_STATUSES:
+                self.rate_limiter.recover(url)
+                return response
+
+            if response.status_code in THROTTLE_STATUSES:
+                self.rate_limiter.throttle(url)
+
+            if attempt >= self.retry_policy.max_retries:
+                return response
+
+            self.metrics.inc("http_retries_total", platform=self.platform_id, host=host, reason=str(response.status_code))
+            delay = self.retry_policy.delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+            print(f"{self.platform_label} returned {response.status_code} for {url}. Retrying in {delay:.1f}s...")
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _record_response(self, host: str, method: str, response: requests.Response, seconds: float) -> None:
+        # The body is already read (no streaming), so `seconds` covers connect, TLS, wait and download,
+        # while response.elapsed stops at the response headers.
+        labels = {"platform": self.platform_id, "host": host}
+        self.metrics.inc("http_requests_total", **labels, method=method, status=response.status_code)
+        self.metrics.inc("http_response_bytes_total", len(response.content), **labels)
+        self.metrics.observe("http_request_seconds", seconds, **labels)
+        self.metrics.observe("http_time_to_headers_seconds", response.elapsed.total_seconds(), **labels)
+
+    def decode_json(self, response: requests.Response):
+        """response.json(), timed into the json_decode_seconds histogram."""
+        started = time.perf_counter()
+        try:
+            return response.json()
+        finally:
+            self.metrics.observe("json_decode_seconds", time.perf_counter() - started, platform=self.platform_id)
+
+    def map_concurrent(self, func: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """Yield func(item) for every item, in input order, with up to `concurrency` calls in flight.
+
+        Items are pulled lazily, so `items` may be a generator. The first exception raised by
+        func (typically AuthenticationError) cancels every pending call and is re-raised. An
+        exception raised by `items` is re-raised after the calls already in flight are yielded.
+        """
+        if self.concurrency <= 1:
+            for item in items:
+                yield func(item)
+            return
+
+        window = self.concurrency * 2
+        iterator = iter(items)
+        pending = deque()
+        source_error = None
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=self.platform_label.lower())
+
+        def submit_next(count: int) -> None:
+            nonlocal source_error
+            if source_error is not None:
+                return
+            try:
+                for item in islice(iterator, count):
+                    pending.append(executor.submit(func, item))
+            except Exception as exc:
+                source_error = exc
+
+        try:
+            submit_next(window)
+            while pending:
+                future = pending.popleft()
+                submit_next(1)
+                yield future.result()
+            if source_error is not None:
+                raise source_error
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
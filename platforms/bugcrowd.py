@@ -1,7 +1,7 @@
 import os
-import re
-import time
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable
 
 from config.constants import (
     DOMAINS_BASENAME,
@@ -9,31 +9,38 @@ from config.constants import (
     TARGETS_BASENAME,
     WILDCARDS_BASENAME,
 )
-from platforms.base import AuthenticationError, BasePlatformClient
-from utils.io import read_lines_resilient
+from platforms.base import AuthenticationError, BasePlatformClient, CrawlInterrupted
+from platforms.state import fingerprint
+from utils.dates import parse_datetime
 from utils.models import ProgramRecord, QueryOptions
+from utils.targets import TargetSink
+
+LISTING_QUERY = "category=bug_bounty&page={page}&sort_by={sort_by}&sort_direction=desc"
+LISTING_URL = "https://bugcrowd.com/engagements.json?" + LISTING_QUERY
+DEFAULT_SORT = "promoted"
+LAUNCH_DATE_SORT = "starts"  # newest launches first, lets --mode new stop paging early
 
 
 class BugcrowdClient(BasePlatformClient):
     platform_label = "Bugcrowd"
+    platform_id = "bugcrowd"
+    default_rate_limit = 10.0
+    default_headers = {
+        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)",
+        "Accept": "*/*",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Accept-Encoding": "gzip, deflate, br, zstd",
+        "Connection": "keep-alive",
+    }
 
     def _token(self) -> str | None:
         bc_creds = self.config.get("credentials", {}).get("bc", {})
         return bc_creds.get("token") or bc_creds.get("cookie")
 
-    def _build_headers(self, token: str, page_number: int | None = None) -> dict:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)",
-            "Accept": "*/*",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br, zstd",
-            "Connection": "keep-alive",
-            "Cookie": token,
-        }
+    def _build_headers(self, token: str, page_number: int | None = None, sort_by: str = DEFAULT_SORT) -> dict:
+        headers = {"Cookie": token}
         if page_number is not None:
-            headers["Referer"] = (
-                f"https://bugcrowd.com/engagements?category=bug_bounty&page={page_number}&sort_by=promoted&sort_direction=desc"
-            )
+            headers["Referer"] = "https://bugcrowd.com/engagements?" + LISTING_QUERY.format(page=page_number, sort_by=sort_by)
         else:
             headers["Referer"] = "https://bugcrowd.com/engagements"
         return headers
@@ -48,10 +55,12 @@ class BugcrowdClient(BasePlatformClient):
                 full_url = f"{base_url}{brief_url}"
                 engagement_urls.append(
                     {
+                        "key": brief_url,
                         "name": engagement.get("name") or engagement.get("code") or brief_url.strip("/"),
                         "url": full_url,
                         "brief_url": brief_url,
                         "launched_at": self._parse_engagement_date(engagement),
+                        "listing_hash": fingerprint(engagement),
                     }
                 )
 
@@ -66,7 +75,7 @@ class BugcrowdClient(BasePlatformClient):
         return None
 
     def _extract_changelog_url(self, engagement_url, brief_url, headers):
-        engagement_response = self.request(engagement_url, headers)
+        engagement_response = self.request(engagement_url, headers, cache=True)
 
         if engagement_response.status_code != 200:
             print(f"Error fetching engagement HTML at {engagement_url}, status code: {engagement_response.status_code}")
@@ -88,13 +97,13 @@ class BugcrowdClient(BasePlatformClient):
         return changelog_url
 
     def _fetch_changelog_and_extract_scope(self, changelog_url, headers):
-        changelog_response = self.request(changelog_url, headers)
+        changelog_response = self.request(changelog_url, headers, cache=True)
 
         if changelog_response.status_code != 200:
             print(f"Error fetching changelog at {changelog_url}, status code: {changelog_response.status_code}")
             return []
 
-        changelog_data = changelog_response.json()
+        changelog_data = self.decode_json(changelog_response)
         scope_items = changelog_data.get("data", {}).get("scope", [{}])[0].get("targets", [])
 
         targets = []
@@ -120,10 +129,7 @@ class BugcrowdClient(BasePlatformClient):
         headers = self._build_headers(token)
 
         try:
-            response = self.request(
-                "https://bugcrowd.com/engagements.json?category=bug_bounty&page=1&sort_by=promoted&sort_direction=desc",
-                headers,
-            )
+            response = self.request(LISTING_URL.format(page=1, sort_by=DEFAULT_SORT), headers)
         except AuthenticationError as exc:
             print(str(exc))
             return False
@@ -138,6 +144,108 @@ class BugcrowdClient(BasePlatformClient):
         print("BC auth preflight succeeded.")
         return True
 
+    def _fetch_listing_page(self, token, page_number, sort_by=DEFAULT_SORT):
+        """Return the engagements on one listing page: [] past the last page, None when the page failed."""
+        url = LISTING_URL.format(page=page_number, sort_by=sort_by)
+        headers = self._build_headers(token, page_number=page_number, sort_by=sort_by)
+
+        try:
+            response = self.request(url, headers)
+        except RuntimeError as exc:
+            print(str(exc))
+            return None
+
+        if response.status_code != 200:
+            print(f"Error: status code {response.status_code} for page {page_number}. Response text: {response.text}")
+            return None
+
+        try:
+            data = self.decode_json(response)
+        except ValueError as exc:
+            print(f"JSON decode error: {exc}. Response text: {response.text}")
+            return None
+
+        engagements = data.get("engagements", [])
+        if not engagements:
+            print(f"No more engagements found on page {page_number}. Stopping.")
+
+        return engagements
+
+    def _iter_listing_pages(self, token, sort_by=DEFAULT_SORT, start_page=1):
+        """Yield (page_number, engagements) while the next listing page is fetched in the background."""
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="bugcrowd-listing") as prefetcher:
+            page_number = start_page
+            next_page = prefetcher.submit(self._fetch_listing_page, token, page_number, sort_by)
+
+            while True:
+                engagements = next_page.result()
+                if engagements is None:
+                    raise CrawlInterrupted(f"Bugcrowd listing stopped at page {page_number}.")
+                if not engagements:
+                    return
+
+                next_page = prefetcher.submit(self._fetch_listing_page, token, page_number + 1, sort_by)
+                yield page_number, engagements
+                page_number += 1
+
+    def _iter_engagements(self, token, query_options: QueryOptions, start_page=1):
+        new_mode = query_options.mode == "new"
+        sort_by = LAUNCH_DATE_SORT if new_mode else DEFAULT_SORT
+        # Early stop is only safe while the listing really comes back newest-first.
+        launch_ordered = new_mode
+        previous_oldest = None
+
+        for page_number, engagements in self._iter_listing_pages(token, sort_by, start_page):
+            engagement_urls = self._generate_engagement_urls(engagements)
+            reached_cutoff = False
+
+            if launch_ordered:
+                dates = [e["launched_at"] for e in engagement_urls if e["launched_at"]]
+                in_order = all(newer >= older for newer, older in zip(dates, dates[1:]))
+                if not in_order or (dates and previous_oldest and dates[0] > previous_oldest):
+                    print("Engagement listing is not ordered by launch date; scanning every page.")
+                    launch_ordered = False
+                elif dates:
+                    previous_oldest = dates[-1]
+                    reached_cutoff = bool(query_options.cutoff and previous_oldest < query_options.cutoff)
+
+            # newest to oldest
+            engagement_urls.sort(key=lambda e: e["launched_at"] or datetime.min, reverse=True)
+
+            for engagement in engagement_urls:
+                launched_at = engagement["launched_at"]
+                if new_mode:
+                    if launched_at is None:
+                        continue
+                    if query_options.cutoff and launched_at < query_options.cutoff:
+                        continue
+
+                engagement["position"] = page_number
+                engagement["sort_by"] = sort_by
+                yield engagement
+
+            if reached_cutoff:
+                print(f"Remaining engagements after page {page_number} are older than the cutoff. Stopping.")
+                return
+
+    def _fetch_engagement_scope(self, token, engagement):
+        """Run the engagement HTML -> changelog JSON chain and return (target, kind) pairs; None means the engagement is skipped."""
+        print(f"Processing engagement: {engagement['name']}")
+        headers = self._build_headers(token, page_number=engagement["position"], sort_by=engagement["sort_by"])
+
+        try:
+            changelog_url = self._extract_changelog_url(engagement["url"], engagement["brief_url"], headers)
+            if not changelog_url:
+                print(f"Failed to get changelog URL for engagement: {engagement['name']}")
+                return None
+
+            return [(target, None) for target in self._fetch_changelog_and_extract_scope(changelog_url, headers)]
+        except AuthenticationError:
+            raise
+        except (RuntimeError, ValueError) as exc:
+            print(f"Failed to fetch scope for engagement {engagement['name']}: {exc}")
+            return None
+
     def run(
         self,
         targets_file,
@@ -145,187 +253,33 @@ class BugcrowdClient(BasePlatformClient):
         domains_file,
         invalid_urls_file,
         query_options: QueryOptions,
+        on_record: Callable[[ProgramRecord], None] | None = None,
     ):
-        base_url = "https://bugcrowd.com/engagements.json?category=bug_bounty&page={}&sort_by=promoted&sort_direction=desc"
         token = self._token()
 
         if not token:
             print("BC token is empty. Set BC_TOKEN in .env.")
             return []
 
-        page_number = 1
-        sleep_time = 0.2
-        all_targets_found = False
-        program_records: list[ProgramRecord] = []
-
         for path in (targets_file, wildcards_file, domains_file, invalid_urls_file):
             directory = os.path.dirname(path)
             if directory:
                 os.makedirs(directory, exist_ok=True)
 
-        with open(targets_file, "w", encoding="utf-8") as targets_file_handle:
-            while not all_targets_found:
-                url = base_url.format(page_number)
-                headers = self._build_headers(token, page_number=page_number)
-
-                try:
-                    response = self.request(url, headers)
-                except AuthenticationError as exc:
-                    print(str(exc))
-                    break
-                except RuntimeError as exc:
-                    print(str(exc))
-                    break
-
-                if response.status_code != 200:
-                    print(f"Error: status code {response.status_code} for page {page_number}. Response text: {response.text}")
-                    break
-
-                try:
-                    data = response.json()
-                except ValueError as exc:
-                    print(f"JSON decode error: {exc}. Response text: {response.text}")
-                    break
-
-                engagements = data.get("engagements", [])
-                if not engagements:
-                    print(f"No more engagements found on page {page_number}. Stopping.")
-                    all_targets_found = True
-                    continue
-
-                engagement_urls = self._generate_engagement_urls(engagements)
-
-                # newest to oldest
-                engagement_urls.sort(key=lambda e: e["launched_at"] or datetime.min, reverse=True)
-
-                for engagement in engagement_urls:
-                    launched_at = engagement["launched_at"]
-                    if query_options.mode == "new":
-                        if launched_at is None:
-                            continue
-                        if query_options.cutoff and launched_at < query_options.cutoff:
-                            continue
-
-                    print(f"Processing engagement: {engagement['name']}")
-                    try:
-                        changelog_url = self._extract_changelog_url(engagement["url"], engagement["brief_url"], headers)
-                    except AuthenticationError as exc:
-                        print(str(exc))
-                        all_targets_found = True
-                        break
-
-                    if not changelog_url:
-                        print(f"Failed to get changelog URL for engagement: {engagement['name']}")
-                        continue
-
-                    try:
-                        scope_targets = self._fetch_changelog_and_extract_scope(changelog_url, headers)
-                    except AuthenticationError as exc:
-                        print(str(exc))
-                        all_targets_found = True
-                        break
-
-                    record = ProgramRecord(platform="bugcrowd", name=engagement["name"], launched_at=launched_at)
-
-                    for target in scope_targets:
-                        targets_file_handle.write(target + "\n")
-                        if "*" in target:
-                            record.wildcards.append(target)
-                        else:
-                            record.domains.append(target)
-
-                    program_records.append(record)
-
-                page_number += 1
-                time.sleep(sleep_time)
-
-        process_targets_file(targets_file, wildcards_file, domains_file, invalid_urls_file)
-        program_records.sort(key=lambda r: r.launched_at or datetime.min, reverse=True)
-        return program_records
-
-
-def parse_datetime(value: str | None) -> datetime | None:
-    if not value:
-        return None
-
-    cleaned = value.replace("Z", "+00:00")
-    try:
-        parsed = datetime.fromisoformat(cleaned)
-        if parsed.tzinfo is not None:
-            return parsed.astimezone(timezone.utc).replace(tzinfo=None)
-        return parsed
-    except ValueError:
-        pass
-
-    for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d"):
-        try:
-            return datetime.strptime(value, fmt)
-        except ValueError:
-            continue
-
-    return None
-
-
-def is_valid_url(url):
-    regex = re.compile(
-        r"^(?:http|ftp|wss)s?://"
-        r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,20}\.?|[A-Z0-9-]{2,}\.?)|"
-        r"localhost|"
-        r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|"
-        r"\[?[A-F0-9]*:[A-F0-9:]+\]?)"
-        r"(?::\d+)?"
-        r"(?:/?|[/?]\S+)$",
-        re.IGNORECASE,
-    )
-    return re.match(regex, url) is not None
-
-
-def process_targets_file(targets_file, wildcards_file, domains_file, invalid_urls_file):
-    wildcards = []
-    invalid_urls = []
-    valid_urls = []
-
-    if not os.path.isfile(targets_file):
-        print(f"Error: {targets_file} does not exist.")
-        return
-
-    try:
-        targets = read_lines_resilient(targets_file)
-        print(f"Read {len(targets)} lines from {targets_file}")
-    except Exception as exc:
-        print(f"Error reading file {targets_file}: {exc}")
-        return
-
-    for target in targets:
-        target = target.strip()
-        if not target:
-            continue
-
-        if "*" in target:
-            wildcards.append(target)
-        elif not is_valid_url(target):
-            invalid_urls.append(target)
-        else:
-            valid_urls.append(target)
-
-    if wildcards:
-        with open(wildcards_file, "w", encoding="utf-8") as wildcard_handle:
-            wildcard_handle.write("\n".join(wildcards) + "\n")
-        print(f"Wildcards saved to {wildcards_file} ({len(wildcards)} found)")
-
-    if invalid_urls:
-        with open(invalid_urls_file, "w", encoding="utf-8") as invalid_handle:
-            invalid_handle.write("\n".join(invalid_urls) + "\n")
-        print(f"Invalid URLs saved to {invalid_urls_file} ({len(invalid_urls)} found)")
-
-    if valid_urls:
-        with open(domains_file, "w", encoding="utf-8") as valid_handle:
-            valid_handle.write("\n".join(valid_urls) + "\n")
-        print(f"Valid URLs saved to {domains_file} ({len(valid_urls)} found)")
+        audit_file = targets_file if self.targets_log else None
+        with TargetSink(wildcards_file, domains_file, invalid_urls_file, audit_file=audit_file) as sink:
+            return self.crawl(
+                sink,
+                query_options,
+                lambda options, page: self._iter_engagements(token, options, start_page=page or 1),
+                lambda engagement: self._fetch_engagement_scope(token, engagement),
+                on_record=on_record,
+            )
 
 
 def check_auth(config):
-    return BugcrowdClient(config).check_auth()
+    with BugcrowdClient(config) as client:
+        return client.check_auth()
 
 
 def main(
@@ -335,6 +289,8 @@ def main(
     domains_file=DOMAINS_BASENAME,
     invalid_urls_file=INVALID_URLS_BASENAME,
     query_options: QueryOptions | None = None,
+    on_record: Callable[[ProgramRecord], None] | None = None,
 ):
     options = query_options or QueryOptions()
-    return BugcrowdClient(config).run(targets_file, wildcards_file, domains_file, invalid_urls_file, options)
+    with BugcrowdClient(config) as client:
+        return client.run(targets_file, wildcards_file, domains_file, invalid_urls_file, options, on_record=on_record)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+CREDENTIAL_HEADERS = ("Authorization", "Cookie", "X-AUTH-TOKEN")
+ACCESS_FLUSH_EVERY = 256
+
+
+@dataclass
+class CachedResponse:
+    response: requests.Response
+    stored_at: float
+    etag: str | None
+    last_modified: str | None
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """SQLite-backed cache of successful responses with TTL, LRU eviction and ETag/Last-Modified revalidation.
+
+    The total body size is tracked in memory, and hit times are written in batches (before eviction, every
+    ACCESS_FLUSH_EVERY hits and on close) rather than once per hit.
+    """
+
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._accessed: dict[str, float] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._conn.commit()
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def key(method: str, url: str, json_data: dict | None = None, headers: dict | None = None) -> str:
+        """Cache key of a request; credentials are hashed in so one account never sees another's responses."""
+        body = json.dumps(json_data, sort_keys=True, separators=(",", ":")) if json_data is not None else ""
+        credentials = CaseInsensitiveDict(headers or {})
+        auth = "\n".join(credentials.get(name, "") for name in CREDENTIAL_HEADERS)
+        auth_hash = hashlib.sha256(auth.encode("utf-8")).hexdigest() if auth.strip() else ""
+        return hashlib.sha256(f"{method.upper()} {url}\n{body}\n{auth_hash}".encode("utf-8")).hexdigest()
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.ttl
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._conn.execute("SELECT url, headers, body, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= ACCESS_FLUSH_EVERY:
+                self._flush_accessed()
+                self._conn.commit()
+
+        url, headers_json, body, stored_at = row
+        headers = CaseInsensitiveDict(json.loads(headers_json))
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = headers
+        response._content = bytes(body)
+        response.encoding = requests.utils.get_encoding_from_headers(headers)
+        return CachedResponse(response, stored_at, headers.get("ETag"), headers.get("Last-Modified"))
+
+    def put(self, key: str, response: requests.Response) -> None:
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        body = response.content
+        now = time.time()
+
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, headers, body, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, json.dumps(headers), sqlite3.Binary(body), len(body), now, now),
+            )
+            self._accessed.pop(key, None)
+            self._total += len(body) - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as revalidated (e.g. after a 304) so its TTL starts over."""
+        now = time.time()
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self._conn.commit()
+
+    def _flush_accessed(self) -> None:
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", [(at, key) for key, at in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _evict(self) -> None:
+        if self._total <= self.max_bytes:
+            return
+
+        # Eviction order depends on recent hits, so write them out first.
+        self._flush_accessed()
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total -= size
+            if self._total <= self.max_bytes:
+                break
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
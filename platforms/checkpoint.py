@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+
+from utils.models import ProgramRecord, QueryOptions
+
+
+class CrawlCheckpoint:
+    """Append-only JSON lines log of one crawl: a header, then one line per finished program.
+
+    Each program line holds its listing key, the listing page (or offset) it came from and its
+    record (null when the program was skipped). Lines are flushed as they are written, so a crawl
+    that dies at any point can be resumed; a torn last line is dropped. The file is removed once
+    the crawl reaches the end of the listing.
+    """
+
+    def __init__(self, path: str, platform: str, query_options: QueryOptions, resume: bool = False):
+        self.path = path
+        self.platform = platform
+        self.query_options = query_options
+        self.records: list[ProgramRecord] = []
+        self.page: int | None = None
+        self._done: set[str] = set()
+        self._entries: list[dict] = []
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if resume:
+            self._load()
+
+        # Rewrite what was loaded, so appends never follow a torn line.
+        self._file = open(path, "w", encoding="utf-8")
+        self._write(self._header())
+        for entry in self._entries:
+            self._write(entry)
+
+    def _header(self) -> dict:
+        cutoff = self.query_options.cutoff
+        return {
+            "platform": self.platform,
+            "mode": self.query_options.mode,
+            "interval_label": self.query_options.interval_label,
+            "cutoff": cutoff.isoformat() if cutoff else None,
+        }
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            print(f"No checkpoint at {self.path}; starting a fresh crawl.")
+            return
+
+        with open(self.path, "r", encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+
+        try:
+            header = json.loads(lines[0]) if lines else None
+        except ValueError:
+            header = None
+
+        expected = self._header()
+        if not header or any(header.get(key) != expected[key] for key in ("platform", "mode", "interval_label")):
+            print(f"Checkpoint {self.path} belongs to a different crawl; starting a fresh crawl.")
+            return
+
+        # The resumed crawl keeps the original cutoff, so --mode new selects the same programs.
+        cutoff = header.get("cutoff")
+        self.query_options = QueryOptions(
+            mode=self.query_options.mode,
+            cutoff=datetime.fromisoformat(cutoff) if cutoff else None,
+            interval_label=self.query_options.interval_label,
+        )
+
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            self._entries.append(entry)
+            self._done.add(entry["key"])
+            self.page = entry["page"]
+            if entry["record"] is not None:
+                self.records.append(ProgramRecord.from_dict(entry["record"]))
+
+        position = "the start" if self.page is None else self.page
+        print(f"Resuming {self.platform} crawl: {len(self._entries)} programs done, resuming the listing at {position}.")
+
+    def _write(self, entry: dict) -> None:
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def is_done(self, key: str) -> bool:
+        """Whether the program was finished before this crawl was resumed."""
+        return key in self._done
+
+    def add(self, key: str, page: int, record: ProgramRecord | None) -> None:
+        """Mark a program finished; record=None marks it skipped so a resume skips it too."""
+        self._write({"key": key, "page": page, "record": record.to_dict() if record else None})
+
+    def complete(self) -> None:
+        """The crawl reached the end of the listing: the checkpoint is no longer needed."""
+        self._file.close()
+        os.remove(self.path)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+            print(f"Crawl checkpoint kept at {self.path}; rerun with --resume to continue.")
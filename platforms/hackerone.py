@@ -1,48 +1,53 @@
 import os
-from datetime import datetime, timezone
+from typing import Callable
 
 from config.constants import DOMAINS_BASENAME, TARGETS_BASENAME, WILDCARDS_BASENAME
 from platforms.base import AuthenticationError, BasePlatformClient
-from utils.io import read_lines_resilient
+from platforms.state import fingerprint
+from utils.dates import parse_datetime
 from utils.models import ProgramRecord, QueryOptions
+from utils.targets import VALID_URL, WILDCARD, TargetSink, classify_target
+
+PAGE_SIZE = 100
 
 
 class HackerOneClient(BasePlatformClient):
     platform_label = "HackerOne"
+    platform_id = "hackerone"
+    stored_domain_kind = VALID_URL
+    audit_program_names = True
+    default_headers = {
+        "Accept": "application/json",
+        "User-Agent": "Mozilla/5.0",
+        "Content-Type": "application/json",
+    }
 
     def _token(self) -> str | None:
         h1_creds = self.config.get("credentials", {}).get("h1", {})
         return h1_creds.get("token") or h1_creds.get("cookie")
 
     def _build_headers(self, token: str) -> dict:
-        headers = {
-            "Accept": "application/json",
-            "User-Agent": "Mozilla/5.0",
-            "Content-Type": "application/json",
-        }
-
         if token.lower().startswith("bearer "):
-            headers["Authorization"] = token
-        else:
-            headers["Cookie"] = token
-
-        return headers
+            return {"Authorization": token}
+        return {"Cookie": token}
 
-    def request_json(self, url, headers, json_data=None):
-        response = self.request(url, headers, method="POST" if json_data else "GET", json_data=json_data)
+    def request_json(self, url, headers, json_data=None, cache=False):
+        response = self.request(url, headers, method="POST" if json_data else "GET", json_data=json_data, cache=cache)
 
         if response.status_code >= 400:
             raise RuntimeError(f"H1 request failed with status {response.status_code}: {response.text[:200]}")
 
-        return response.json()
+        return self.decode_json(response)
 
-    def fetch_opportunities_with_sort_direction(self, api_url, headers, sort_field, sort_direction="DESC"):
-        print(f"Fetching opportunities sorted by {sort_field} in {sort_direction} order...")
+    def fetch_opportunities_with_sort_direction(
+        self, api_url, headers, sort_field, sort_direction="DESC", offset=0, size=PAGE_SIZE
+    ):
+        print(f"Fetching opportunities sorted by {sort_field} in {sort_direction} order (from {offset})...")
         query = {
             "operationName": "DiscoveryQuery",
             "variables": {
-                "from": 0,
-                "size": 100,
+                "from": offset,
+                "size": size,
                 "query": {},
                 "filter": {
                     "bool": {
@@ -94,6 +99,8 @@ class HackerOneClient(BasePlatformClient):
                     id
                     handle
                     launched_at
+                    last_updated_at
+                    structured_scope_stats
                     __typename
                   }
                   __typename
@@ -112,7 +119,7 @@ class HackerOneClient(BasePlatformClient):
 
         raise RuntimeError(f"Unexpected response format: {response}")
 
-    def fetch_identifiers_for_handle(self, api_url, headers, handle):
+    def fetch_identifiers_page(self, api_url, headers, handle, offset=0, size=PAGE_SIZE):
         query = {
             "operationName": "PolicySearchStructuredScopesQuery",
             "variables": {
@@ -122,8 +129,8 @@ class HackerOneClient(BasePlatformClient):
                 "eligibleForBounty": None,
                 "asmTagIds": [],
                 "assetTypes": [],
-                "from": 0,
-                "size": 100,
+                "from": offset,
+                "size": size,
                 "sort": {"field": "cvss_score", "direction": "DESC"},
                 "product_area": "h1_assets",
                 "product_feature": "policy_scopes",
@@ -170,23 +177,78 @@ class HackerOneClient(BasePlatformClient):
             """,
         }
 
-        response = self.request_json(api_url, headers, query)
+        response = self.request_json(api_url, headers, query, cache=True)
 
         if "data" in response and "team" in response["data"] and response["data"]["team"]:
             return response["data"]["team"].get("structured_scopes_search", {}).get("nodes", [])
 
         return []
 
-    def fetch_opportunities_sort_desc(self, api_url, headers):
-        return self.fetch_opportunities_with_sort_direction(api_url, headers, sort_field="launched_at", sort_direction="DESC")
+    def fetch_identifiers_for_handle(self, api_url, headers, handle):
+        return list(paginate(lambda offset, size: self.fetch_identifiers_page(api_url, headers, handle, offset, size)))
+
+    def fetch_opportunities_sort_desc(self, api_url, headers, offset=0, size=PAGE_SIZE):
+        return self.fetch_opportunities_with_sort_direction(
+            api_url, headers, sort_field="launched_at", sort_direction="DESC", offset=offset, size=size
+        )
 
-    def remove_duplicates(self, file_path):
-        lines = [line.strip() for line in read_lines_resilient(file_path)]
-        unique_lines = sorted({line for line in lines if line})
+    def iter_opportunities(self, api_url, headers, offset=0):
+        """Yield opportunity nodes newest first, fetching the next page only when the current one is consumed."""
 
-        with open(file_path, "w", encoding="utf-8") as file:
-            if unique_lines:
-                file.write("\n".join(unique_lines) + "\n")
+        def fetch_page(offset, size):
+            data = self.fetch_opportunities_sort_desc(api_url, headers, offset=offset, size=size)
+            return data.get("opportunities_search", {}).get("nodes", [])
+
+        return paginate(fetch_page, offset=offset)
+
+    def _iter_programs(self, api_url, headers, query_options: QueryOptions, offset=0):
+        """Yield the crawl's program dicts newest first, stopping at the --mode new cutoff."""
+        for position, opportunity in enumerate(self.iter_opportunities(api_url, headers, offset), offset):
+            handle = opportunity.get("handle")
+            launched_at = parse_datetime(opportunity.get("launched_at"))
+            if not handle:
+                continue
+
+            if query_options.mode == "new":
+                if launched_at is None:
+                    continue
+                if query_options.cutoff and launched_at < query_options.cutoff:
+                    # Sorted by launched_at DESC: everything after this is older too.
+                    return
+
+            yield {
+                "key": handle,
+                "name": handle,
+                "launched_at": launched_at,
+                # last_updated_at and structured_scope_stats move when the program's scope is edited.
+                "listing_hash": fingerprint(opportunity),
+                "position": position - position % PAGE_SIZE,
+            }
+
+    def _fetch_scope_targets(self, api_url, headers, program):
+        """Return the program's (identifier, kind) pairs, or None when its scopes could not be fetched."""
+        print(f"Fetching identifiers for handle: {program['key']}")
+        try:
+            identifiers = self.fetch_identifiers_for_handle(api_url, headers, program["key"])
+        except AuthenticationError:
+            raise
+        except RuntimeError as exc:
+            print(str(exc))
+            return None
+
+        targets = []
+        for scope in identifiers:
+            identifier = scope.get("identifier")
+            display_name = scope.get("display_name")
+            if not identifier:
+                continue
+
+            # Url/Domain assets containing "*" are really wildcards; keep them out of domains.txt.
+            if display_name in ("Domain", "Url") and classify_target(identifier) != WILDCARD:
+                targets.append((identifier, VALID_URL))
+            elif display_name in ("Domain", "Url", "Wildcard"):
+                targets.append((identifier, WILDCARD))
+        return targets
 
     def check_auth(self):
         token = self._token()
@@ -208,7 +270,14 @@ class HackerOneClient(BasePlatformClient):
         print("H1 auth preflight succeeded.")
         return True
 
-    def run(self, targets_file, wildcards_file, domains_file, query_options: QueryOptions):
+    def run(
+        self,
+        targets_file,
+        wildcards_file,
+        domains_file,
+        query_options: QueryOptions,
+        on_record: Callable[[ProgramRecord], None] | None = None,
+    ):
         print("Starting H1 script...")
         graphql_url = "https://hackerone.com/graphql"
         token = self._token()
@@ -223,100 +292,30 @@ class HackerOneClient(BasePlatformClient):
                 os.makedirs(directory, exist_ok=True)
 
         headers = self._build_headers(token)
-
-        try:
-            opportunities_data_desc = self.fetch_opportunities_sort_desc(graphql_url, headers)
-        except (AuthenticationError, RuntimeError) as exc:
-            print(str(exc))
-            return []
-
-        opportunities = opportunities_data_desc.get("opportunities_search", {}).get("nodes", [])
-        opportunities_filtered = []
-
-        for opportunity in opportunities:
-            handle = opportunity.get("handle")
-            launched_at = parse_datetime(opportunity.get("launched_at"))
-            if not handle:
-                continue
-
-            if query_options.mode == "new":
-                if launched_at is None:
-                    continue
-                if query_options.cutoff and launched_at < query_options.cutoff:
-                    continue
-
-            opportunities_filtered.append({"handle": handle, "launched_at": launched_at})
-
-        opportunities_filtered.sort(key=lambda x: x["launched_at"] or datetime.min, reverse=True)
-
-        with open(targets_file, "w", encoding="utf-8") as file:
-            handles = [item["handle"] for item in opportunities_filtered]
-            if handles:
-                file.write("\n".join(handles) + "\n")
-
-        all_wildcards = []
-        all_domains = []
-        records: list[ProgramRecord] = []
-
-        for item in opportunities_filtered:
-            handle = item["handle"]
-            launched_at = item["launched_at"]
-            print(f"Fetching identifiers for handle: {handle}")
-
-            try:
-                identifiers = self.fetch_identifiers_for_handle(graphql_url, headers, handle)
-            except (AuthenticationError, RuntimeError) as exc:
-                print(str(exc))
-                continue
-
-            record = ProgramRecord(platform="hackerone", name=handle, launched_at=launched_at)
-
-            for scope in identifiers:
-                identifier = scope.get("identifier")
-                display_name = scope.get("display_name")
-                if not identifier:
-                    continue
-
-                if display_name in ("Domain", "Url"):
-                    record.domains.append(identifier)
-                    all_domains.append(identifier)
-                elif display_name == "Wildcard":
-                    record.wildcards.append(identifier)
-                    all_wildcards.append(identifier)
-
-            records.append(record)
-
-        with open(wildcards_file, "w", encoding="utf-8") as file:
-            if all_wildcards:
-                file.write("\n".join(all_wildcards) + "\n")
-
-        with open(domains_file, "w", encoding="utf-8") as file:
-            if all_domains:
-                file.write("\n".join(all_domains) + "\n")
-
-        self.remove_duplicates(wildcards_file)
-        self.remove_duplicates(domains_file)
-
-        records.sort(key=lambda r: r.launched_at or datetime.min, reverse=True)
-        return records
-
-
-def parse_datetime(value: str | None) -> datetime | None:
-    if not value:
-        return None
-
-    cleaned = value.replace("Z", "+00:00")
-    try:
-        parsed = datetime.fromisoformat(cleaned)
-        if parsed.tzinfo is not None:
-            return parsed.astimezone(timezone.utc).replace(tzinfo=None)
-        return parsed
-    except ValueError:
-        return None
+        audit_file = targets_file if self.targets_log else None
+        with TargetSink(wildcards_file, domains_file, audit_file=audit_file) as sink:
+            return self.crawl(
+                sink,
+                query_options,
+                lambda options, offset: self._iter_programs(graphql_url, headers, options, offset or 0),
+                lambda program: self._fetch_scope_targets(graphql_url, headers, program),
+                on_record=on_record,
+            )
+
+
+def paginate(fetch_page, page_size=PAGE_SIZE, offset=0):
+    """Yield nodes from fetch_page(offset, size) page by page until a short or empty page."""
+    while True:
+        nodes = fetch_page(offset, page_size)
+        yield from nodes
+        if len(nodes) < page_size:
+            return
+        offset += page_size
 
 
 def check_auth(config):
-    return HackerOneClient(config).check_auth()
+    with HackerOneClient(config) as client:
+        return client.check_auth()
 
 
 def main(
@@ -325,6 +324,8 @@ def main(
     wildcards_file=WILDCARDS_BASENAME,
     domains_file=DOMAINS_BASENAME,
     query_options: QueryOptions | None = None,
+    on_record: Callable[[ProgramRecord], None] | None = None,
 ):
     options = query_options or QueryOptions()
-    return HackerOneClient(config).run(targets_file, wildcards_file, domains_file, options)
+    with HackerOneClient(config) as client:
+        return client.run(targets_file, wildcards_file, domains_file, options, on_record=on_record)
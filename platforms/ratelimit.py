@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+MIN_RATE = 0.2  # never slow a host below one request every 5 seconds
+THROTTLED_START_RATE = 4.0  # first limit applied to an unlimited host once it throttles
+UNLIMITED_CEILING = 50.0  # an unlimited host that recovers past this rate is unlimited again
+RECOVERY_STEP = 0.1
+
+
+@dataclass
+class _Bucket:
+    rate: float | None
+    ceiling: float | None
+    tokens: float = 1.0
+    updated: float = 0.0
+
+
+class RateLimiter:
+    """Thread-safe per-host token bucket with additive-increase / multiplicative-decrease.
+
+    `throttle` halves a host's rate when it answers 429/503, `recover` nudges it back
+    towards the configured rate after each successful response.
+    """
+
+    def __init__(self, rate: float | None = None):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+
+    def _bucket(self, url: str) -> _Bucket:
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _Bucket(rate=self.rate, ceiling=self.rate, updated=time.monotonic())
+            self._buckets[host] = bucket
+        return bucket
+
+    def current_rate(self, url: str) -> float | None:
+        with self._lock:
+            return self._bucket(url).rate
+
+    def wait(self, url: str) -> None:
+        with self._lock:
+            bucket = self._bucket(url)
+            if bucket.rate is None:
+                return
+
+            now = time.monotonic()
+            bucket.tokens = min(1.0, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            # Going negative reserves a future slot so concurrent callers queue up in order.
+            bucket.tokens -= 1.0
+            delay = -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttle(self, url: str) -> None:
+        with self._lock:
+            bucket = self._bucket(url)
+            if bucket.rate is None:
+                bucket.rate = THROTTLED_START_RATE
+                bucket.tokens = min(bucket.tokens, 0.0)
+            else:
+                bucket.rate = max(MIN_RATE, bucket.rate / 2)
+
+    def recover(self, url: str) -> None:
+        with self._lock:
+            bucket = self._bucket(url)
+            if bucket.rate is None:
+                return
+
+            ceiling = bucket.ceiling or UNLIMITED_CEILING
+            if bucket.rate + RECOVERY_STEP >= ceiling:
+                bucket.rate = bucket.ceiling
+            else:
+                bucket.rate += RECOVERY_STEP
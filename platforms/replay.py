@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import os
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from platforms.state import fingerprint
+
+
+def fixture_key(method: str, url: str, json_data: dict | None) -> str:
+    return fingerprint([method.upper(), url, json_data])
+
+
+def replay_path(url: str) -> str:
+    """https://bugcrowd.com/engagements.json?page=1 -> /bugcrowd.com/engagements.json?page=1"""
+    parts = urlsplit(url)
+    return f"/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Send every request to a local stand-in server instead of the real platform.
+
+    The original host becomes the first path segment, so one stand-in can serve every platform.
+    """
+
+    def __init__(self, replay_url: str, **kwargs):
+        self.replay_url = replay_url.rstrip("/")
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        request.url = self.replay_url + replay_path(request.url)
+        return super().send(request, **kwargs)
+
+
+class FixtureRecorder:
+    """Save each platform response as <directory>/<fixture_key>.json for the stand-in to replay."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def record(self, method: str, url: str, json_data: dict | None, response: requests.Response) -> None:
+        fixture = {
+            "method": method.upper(),
+            "url": url,
+            "json": json_data,
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", ""),
+            "body": response.text,
+        }
+        path = os.path.join(self.directory, fixture_key(method, url, json_data) + ".json")
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(fixture, handle)
+        os.replace(temp_path, path)
+
+
+def load_fixtures(directory: str) -> dict[str, dict]:
+    fixtures = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name), "r", encoding="utf-8") as handle:
+            fixture = json.load(handle)
+        fixtures[fixture_key(fixture["method"], fixture["url"], fixture.get("json"))] = fixture
+    return fixtures
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+from utils.metrics import Metrics
+from utils.models import ProgramRecord
+
+
+@dataclass
+class PlatformJob:
+    key: str  # bc|h1|ywh, also the name of the platform's output subdirectory
+    label: str
+    run: Callable[[], list[ProgramRecord] | None]
+
+
+def _run_isolated(job: PlatformJob, metrics: Metrics | None = None) -> list[ProgramRecord] | None:
+    print(f"Running {job.label} script...")
+    try:
+        if metrics:
+            with metrics.stage(f"crawl_{job.key}"):
+                records = job.run() or []
+        else:
+            records = job.run() or []
+    except Exception as exc:  # one platform failing must not take the others down
+        print(f"{job.label} run failed: {exc}")
+        traceback.print_exc()
+        if metrics:
+            metrics.inc("platform_failures_total", platform=job.key)
+        return None
+
+    print(f"{job.label} finished with {len(records)} programs.")
+    if metrics:
+        metrics.inc("programs_total", len(records), platform=job.key)
+    return records
+
+
+def run_platforms(jobs: list[PlatformJob], metrics: Metrics | None = None) -> dict[str, list[ProgramRecord] | None]:
+    """Run every job on its own thread and return records per job key, in job order.
+
+    Total wall time is that of the slowest platform. A job that raises is logged and maps to None.
+    With metrics, each job's duration is recorded as the crawl_<key> stage.
+    """
+    if len(jobs) <= 1:
+        return {job.key: _run_isolated(job, metrics) for job in jobs}
+
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="platform") as executor:
+        futures = [(job.key, executor.submit(_run_isolated, job, metrics)) for job in jobs]
+        return {key: future.result() for key, future in futures}
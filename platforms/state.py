@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+COMMIT_EVERY = 100
+
+
+def fingerprint(value) -> str:
+    """Stable hash of a JSON-serialisable value, used to spot listing entries and scopes that changed."""
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ProgramState:
+    platform: str
+    key: str
+    name: str
+    launched_at: datetime | None
+    listing_hash: str
+    scope_hash: str
+    wildcards: list[str]
+    domains: list[str]
+    fetched_at: float
+    seen_at: float
+
+
+class ProgramStateStore:
+    """SQLite-backed record of every program seen so far: its listing entry, last scope and fetch time.
+
+    Writes are committed in batches of COMMIT_EVERY; commit() flushes the rest and close() commits too.
+    """
+
+    def __init__(self, path: str, max_age: float):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS programs (
+                platform TEXT NOT NULL,
+                key TEXT NOT NULL,
+                name TEXT NOT NULL,
+                launched_at TEXT,
+                listing_hash TEXT NOT NULL,
+                scope_hash TEXT NOT NULL,
+                wildcards TEXT NOT NULL,
+                domains TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                seen_at REAL NOT NULL,
+                PRIMARY KEY (platform, key)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def is_current(self, state: ProgramState) -> bool:
+        return time.time() - state.fetched_at < self.max_age
+
+    def get(self, platform: str, key: str) -> ProgramState | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name, launched_at, listing_hash, scope_hash, wildcards, domains, fetched_at, seen_at "
+                "FROM programs WHERE platform = ? AND key = ?",
+                (platform, key),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        name, launched_at, listing_hash, scope_hash, wildcards, domains, fetched_at, seen_at = row
+        return ProgramState(
+            platform=platform,
+            key=key,
+            name=name,
+            launched_at=datetime.fromisoformat(launched_at) if launched_at else None,
+            listing_hash=listing_hash,
+            scope_hash=scope_hash,
+            wildcards=json.loads(wildcards),
+            domains=json.loads(domains),
+            fetched_at=fetched_at,
+            seen_at=seen_at,
+        )
+
+    def put(
+        self,
+        platform: str,
+        key: str,
+        name: str,
+        launched_at: datetime | None,
+        listing_hash: str,
+        wildcards: list[str],
+        domains: list[str],
+    ) -> str:
+        """Store a freshly fetched program and return its scope hash."""
+        scope_hash = fingerprint({"wildcards": sorted(wildcards), "domains": sorted(domains)})
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO programs "
+                "(platform, key, name, launched_at, listing_hash, scope_hash, wildcards, domains, fetched_at, seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    platform,
+                    key,
+                    name,
+                    launched_at.isoformat() if launched_at else None,
+                    listing_hash,
+                    scope_hash,
+                    json.dumps(wildcards),
+                    json.dumps(domains),
+                    now,
+                    now,
+                ),
+            )
+            self._written()
+        return scope_hash
+
+    def mark_seen(self, platform: str, key: str) -> None:
+        """Record that a program was still listed, without resetting its fetch time."""
+        with self._lock:
+            self._conn.execute("UPDATE programs SET seen_at = ? WHERE platform = ? AND key = ?", (time.time(), platform, key))
+            self._written()
+
+    def _written(self) -> None:
+        # Caller holds the lock.
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
@@ -1 +1,218 @@
-# Space for YesWeHack logic
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable
+
+from config.constants import (
+    DOMAINS_BASENAME,
+    INVALID_URLS_BASENAME,
+    TARGETS_BASENAME,
+    WILDCARDS_BASENAME,
+)
+from platforms.base import AuthenticationError, BasePlatformClient, CrawlInterrupted
+from platforms.state import fingerprint
+from utils.dates import parse_datetime
+from utils.models import ProgramRecord, QueryOptions
+from utils.targets import TargetSink
+
+API_URL = "https://api.yeswehack.com"
+LISTING_URL = API_URL + "/programs?page={page}&resultsPerPage={per_page}"
+PROGRAM_URL = API_URL + "/programs/{slug}"
+PAGE_SIZE = 50
+ACCEPTED_SCOPE_TYPES = {"web-application", "api", "wildcard"}
+JWT_RE = re.compile(r"^[\w-]+\.[\w-]+\.[\w-]+$")
+
+
+class YesWeHackClient(BasePlatformClient):
+    platform_label = "YesWeHack"
+    platform_id = "yeswehack"
+    default_rate_limit = 10.0
+    default_headers = {
+        "Accept": "application/json",
+        "User-Agent": "Mozilla/5.0",
+    }
+
+    def _token(self) -> str | None:
+        ywh_creds = self.config.get("credentials", {}).get("ywh", {})
+        return ywh_creds.get("token")
+
+    def _build_headers(self, token: str) -> dict:
+        # A JWT (from the login flow) is sent as a Bearer token; a personal access token goes in X-AUTH-TOKEN.
+        if token.lower().startswith("bearer "):
+            return {"Authorization": token}
+        if JWT_RE.match(token):
+            return {"Authorization": f"Bearer {token}"}
+        return {"X-AUTH-TOKEN": token}
+
+    def _parse_program_date(self, program) -> datetime | None:
+        for key in ("start_date", "startDate", "launched_at", "launchedAt", "public_at", "created_at", "createdAt"):
+            parsed = parse_datetime(program.get(key))
+            if parsed:
+                return parsed
+        return None
+
+    def check_auth(self) -> bool:
+        token = self._token()
+        if not token:
+            print("YWH token is empty. Set YWH_TOKEN in .env.")
+            return False
+
+        try:
+            response = self.request(LISTING_URL.format(page=1, per_page=1), self._build_headers(token))
+        except AuthenticationError as exc:
+            print(str(exc))
+            return False
+        except RuntimeError as exc:
+            print(str(exc))
+            return False
+
+        if response.status_code != 200:
+            print(f"YWH auth preflight failed with status {response.status_code}")
+            return False
+
+        print("YWH auth preflight succeeded.")
+        return True
+
+    def _fetch_listing_page(self, headers, page_number):
+        """Return (programs, page count) for one listing page; programs is None when the page failed."""
+        url = LISTING_URL.format(page=page_number, per_page=PAGE_SIZE)
+
+        try:
+            response = self.request(url, headers)
+        except RuntimeError as exc:
+            print(str(exc))
+            return None, 0
+
+        if response.status_code != 200:
+            print(f"Error: status code {response.status_code} for page {page_number}. Response text: {response.text[:200]}")
+            return None, 0
+
+        try:
+            data = self.decode_json(response)
+        except ValueError as exc:
+            print(f"JSON decode error: {exc}. Response text: {response.text[:200]}")
+            return None, 0
+
+        pagination = data.get("pagination") or {}
+        return data.get("items") or [], int(pagination.get("nb_pages") or 0)
+
+    def _iter_listing_pages(self, headers, start_page=1):
+        """Yield (page_number, programs) while the next listing page is fetched in the background."""
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="yeswehack-listing") as prefetcher:
+            page_number = start_page
+            next_page = prefetcher.submit(self._fetch_listing_page, headers, page_number)
+
+            while True:
+                programs, page_count = next_page.result()
+                if programs is None:
+                    raise CrawlInterrupted(f"YesWeHack listing stopped at page {page_number}.")
+                if not programs:
+                    return
+
+                last_page = page_count and page_number >= page_count
+                if not last_page:
+                    next_page = prefetcher.submit(self._fetch_listing_page, headers, page_number + 1)
+                yield page_number, programs
+                if last_page:
+                    return
+                page_number += 1
+
+    def _iter_programs(self, headers, query_options: QueryOptions, start_page=1):
+        for page_number, programs in self._iter_listing_pages(headers, start_page):
+            for program in programs:
+                slug = program.get("slug")
+                # Disabled programs and programs without bounties (VDPs) have nothing to hunt for.
+                if not slug or program.get("disabled") or program.get("bounty") is False:
+                    continue
+
+                launched_at = self._parse_program_date(program)
+                if query_options.mode == "new" and launched_at and query_options.cutoff and launched_at < query_options.cutoff:
+                    continue
+
+                yield {
+                    "key": slug,
+                    "name": program.get("title") or slug,
+                    "launched_at": launched_at,
+                    "listing_hash": fingerprint(program),
+                    "position": page_number,
+                }
+
+    def _fetch_program_scope(self, headers, program):
+        """Return the (target, kind) pairs on the program's detail page, or None when it failed.
+
+        The listing does not always carry a launch date, so a missing one is taken from the detail page.
+        """
+        print(f"Processing program: {program['name']}")
+        url = PROGRAM_URL.format(slug=program["key"])
+
+        try:
+            response = self.request(url, headers, cache=True)
+            if response.status_code != 200:
+                print(f"Error fetching program {program['key']}, status code: {response.status_code}")
+                return None
+            data = self.decode_json(response)
+        except AuthenticationError:
+            raise
+        except (RuntimeError, ValueError) as exc:
+            print(f"Failed to fetch scope for program {program['key']}: {exc}")
+            return None
+
+        program["launched_at"] = program["launched_at"] or self._parse_program_date(data)
+        targets = []
+        for scope in data.get("scopes") or []:
+            target = (scope.get("scope") or "").strip()
+            if target and scope.get("scope_type") in ACCEPTED_SCOPE_TYPES:
+                targets.append((target, None))
+        return targets
+
+    def run(
+        self,
+        targets_file,
+        wildcards_file,
+        domains_file,
+        invalid_urls_file,
+        query_options: QueryOptions,
+        on_record: Callable[[ProgramRecord], None] | None = None,
+    ):
+        token = self._token()
+
+        if not token:
+            print("YWH token is empty. Set YWH_TOKEN in .env.")
+            return []
+
+        headers = self._build_headers(token)
+
+        for path in (targets_file, wildcards_file, domains_file, invalid_urls_file):
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        audit_file = targets_file if self.targets_log else None
+        with TargetSink(wildcards_file, domains_file, invalid_urls_file, audit_file=audit_file) as sink:
+            return self.crawl(
+                sink,
+                query_options,
+                lambda options, page: self._iter_programs(headers, options, start_page=page or 1),
+                lambda program: self._fetch_program_scope(headers, program),
+                on_record=on_record,
+            )
+
+
+def check_auth(config):
+    with YesWeHackClient(config) as client:
+        return client.check_auth()
+
+
+def main(
+    config,
+    targets_file=TARGETS_BASENAME,
+    wildcards_file=WILDCARDS_BASENAME,
+    domains_file=DOMAINS_BASENAME,
+    invalid_urls_file=INVALID_URLS_BASENAME,
+    query_options: QueryOptions | None = None,
+    on_record: Callable[[ProgramRecord], None] | None = None,
+):
+    options = query_options or QueryOptions()
+    with YesWeHackClient(config) as client:
+        return client.run(targets_file, wildcards_file, domains_file, invalid_urls_file, options, on_record=on_record)
@@ -3,7 +3,7 @@ from setuptools import find_packages, setup
 setup(
     name='bbp_domain_scraper',
     version='1.1.0',
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests', 'tests.*']),
     install_requires=['requests'],
     entry_points={
         'console_scripts': [
@@ -0,0 +1,41 @@
+import sqlite3
+
+import requests
+
+import main
+from platforms.base import open_response_cache
+from platforms.cache import ResponseCache
+
+
+def make_response(size):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = "https://example.com/"
+    response._content = b"x" * size
+    return response
+
+
+def test_clients_share_one_cache_and_its_size_bound(tmp_path):
+    client_options = {"state": False, "cache_path": str(tmp_path / "http_cache.sqlite3"), "cache_max_bytes": 10_000}
+    cache = open_response_cache(client_options)
+    clients = main.open_clients({"client": client_options}, ["bc", "h1", "ywh"], cache=cache)
+    try:
+        assert [client.cache for client in clients.values()] == [cache, cache, cache]
+        for index in range(30):
+            client = list(clients.values())[index % len(clients)]
+            client.cache.put(ResponseCache.key("GET", f"https://example.com/{index}"), make_response(1_000))
+    finally:
+        for client in clients.values():
+            client.close()
+        cache.close()
+
+    with sqlite3.connect(tmp_path / "http_cache.sqlite3") as conn:
+        stored = conn.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    assert stored <= 10_000
+
+
+def test_cache_key_depends_on_credentials_only():
+    url = "https://example.com/programs/acme"
+    assert ResponseCache.key("GET", url, None, {"Cookie": "a"}) != ResponseCache.key("GET", url, None, {"Cookie": "b"})
+    assert ResponseCache.key("GET", url, None, {"cookie": "a"}) == ResponseCache.key("GET", url, None, {"Cookie": "a"})
+    assert ResponseCache.key("GET", url) == ResponseCache.key("GET", url, None, {"Accept": "application/json"})
@@ -0,0 +1,87 @@
+import pytest
+
+from utils.normalize import Target, canonical_url, canonical_wildcard, host_of, parse_target
+from utils.post_digest import classify_wildcard
+
+
+@pytest.mark.parametrize("value", ["Example.com", "https://example.com/", "example.com", "HTTPS://EXAMPLE.COM:443/"])
+def test_spellings_of_one_host_collapse_to_one_url(value):
+    assert canonical_url(value) == "https://example.com"
+
+
+@pytest.mark.parametrize(
+    "value, target",
+    [
+        ("Example.com", Target(None, "example.com", None, "", "")),
+        ("http://example.com:80", Target("http", "example.com", None, "", "")),
+        ("ftp://example.com:21/pub", Target("ftp", "example.com", None, "/pub", "")),
+        ("http://example.com:443/a", Target("http", "example.com", 443, "/a", "")),
+        ("https://user:pw@example.com/x?y=1#frag", Target("https", "example.com", None, "/x", "y=1")),
+        ("https://bücher.de/", Target("https", "xn--bcher-kva.de", None, "", "")),
+        ("münchen.DE.", Target(None, "xn--mnchen-3ya.de", None, "", "")),
+        ("http://[::1]:8080/x?y", Target("http", "[::1]", 8080, "/x", "y")),
+    ],
+)
+def test_parse_target(value, target):
+    assert parse_target(value) == target
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["", "   ", "exa mple.com", "*.example.com", "https://*.example.com/", "https://example.com:99999", "https://ex!ample.com"],
+)
+def test_parse_target_rejects_non_host_urls(value):
+    assert parse_target(value) is None
+    assert canonical_url(value) is None
+
+
+@pytest.mark.parametrize(
+    "value, url",
+    [
+        ("user@example.com:8443/path", "https://example.com:8443/path"),
+        ("https://bücher.de", "https://xn--bcher-kva.de"),
+        ("example.com", "https://example.com"),
+    ],
+)
+def test_canonical_url(value, url):
+    assert canonical_url(value) == url
+
+
+@pytest.mark.parametrize(
+    "value, wildcard",
+    [
+        ("*.Example.COM.", "*.example.com"),
+        ("https://*.example.com/", "*.example.com"),
+        ("*.BÜCHER.de", "*.xn--bcher-kva.de"),
+        ("*.example.com/path", "*.example.com/path"),
+    ],
+)
+def test_canonical_wildcard(value, wildcard):
+    assert canonical_wildcard(value) == wildcard
+
+
+@pytest.mark.parametrize(
+    "line, result",
+    [
+        ("*.Example.com", ("wildcard", "example.com")),
+        ("https://*.example.com", ("wildcard", "example.com")),
+        ("*.-foo.com", ("wildcard", "foo.com")),
+        ("*", (None, None)),
+    ],
+)
+def test_classify_wildcard(line, result):
+    assert classify_wildcard(line) == result
+
+
+@pytest.mark.parametrize(
+    "value, host",
+    [
+        ("https://User@Example.com:8443/path?q#f", "example.com"),
+        ("*.Example.COM.", "*.example.com"),
+        ("https://[::1]:8080/x", "[::1]"),
+        ("http://[2001:DB8::1]/a", "[2001:db8::1]"),
+        ("[::1]", "[::1]"),
+    ],
+)
+def test_host_of_strips_scheme_userinfo_port_and_path(value, host):
+    assert host_of(value) == host
@@ -0,0 +1,66 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import main
+from benchmarks.standin import PlatformStandIn
+from platforms.base import open_state_store
+from platforms.bugcrowd import BugcrowdClient
+from platforms.hackerone import HackerOneClient
+from utils.models import QueryOptions
+
+PROGRAMS = 40
+
+
+@pytest.fixture
+def standin():
+    with PlatformStandIn(bc_programs=PROGRAMS, h1_programs=PROGRAMS, latency=0.01) as server:
+        yield server
+
+
+def test_concurrent_clients_share_one_state_store(standin, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client_options = {
+        "replay_url": standin.url,
+        "cache": False,
+        "state_path": str(tmp_path / "programs.sqlite3"),
+        "checkpoint_dir": str(tmp_path / "checkpoints"),
+        "rate_limit": 1000,
+        "concurrency": 2,
+    }
+    config = {"credentials": {"bc": {"token": "bc"}, "h1": {"token": "h1"}}, "client": client_options}
+    state = open_state_store(client_options)
+    clients = [BugcrowdClient(config, state=state), HackerOneClient(config, state=state)]
+
+    def run(client):
+        outputs = [str(tmp_path / client.platform_id / name) for name in ("targets.txt", "wildcards.txt", "domains.txt", "invalid.txt")]
+        if isinstance(client, HackerOneClient):
+            outputs.pop()
+        return client.run(*outputs, QueryOptions())
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+            results = list(executor.map(run, clients))
+    finally:
+        for client in clients:
+            client.close()
+        state.close()
+
+    assert [len(records) for records in results] == [PROGRAMS, PROGRAMS]
+    assert all(client.last_run_complete for client in clients)
+    with sqlite3.connect(tmp_path / "programs.sqlite3") as conn:
+        rows = dict(conn.execute("SELECT platform, COUNT(*) FROM programs GROUP BY platform").fetchall())
+    assert rows == {"bugcrowd": PROGRAMS, "hackerone": PROGRAMS}
+
+
+def test_open_clients_give_every_platform_the_same_state_store(tmp_path):
+    client_options = {"cache": False, "state_path": str(tmp_path / "programs.sqlite3")}
+    state = open_state_store(client_options)
+    clients = main.open_clients({"client": client_options}, ["bc", "h1", "ywh"], state=state)
+    try:
+        assert [client.state for client in clients.values()] == [state, state, state]
+    finally:
+        for client in clients.values():
+            client.close()
+        state.close()
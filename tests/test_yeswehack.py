@@ -0,0 +1,77 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from benchmarks.standin import PlatformStandIn
+from platforms.yeswehack import YesWeHackClient
+from utils.models import QueryOptions
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "yeswehack")
+LISTING_PAGES = 2
+
+
+@pytest.fixture
+def standin(tmp_path, monkeypatch):
+    # Checkpoints group targets by registrable domain, which caches the suffix index under data/.
+    monkeypatch.chdir(tmp_path)
+    with PlatformStandIn(fixtures_dir=FIXTURES_DIR) as server:
+        yield server
+
+
+def crawl(standin, tmp_path, query_options):
+    config = {
+        "credentials": {"ywh": {"token": "pat-0123456789"}},
+        "client": {
+            "replay_url": standin.url,
+            "cache": False,
+            "state": False,
+            "checkpoint_dir": str(tmp_path / "checkpoints"),
+            "rate_limit": 1000,
+            "concurrency": 4,
+        },
+    }
+    outputs = [str(tmp_path / name) for name in ("targets.txt", "wildcards.txt", "domains.txt", "invalid_urls.txt")]
+    with YesWeHackClient(config) as client:
+        records = client.run(*outputs, query_options)
+        return client, {record.name: record for record in records}
+
+
+def test_walks_every_listing_page_and_skips_vdp_and_disabled_programs(standin, tmp_path):
+    client, records = crawl(standin, tmp_path, QueryOptions())
+
+    assert client.last_run_complete
+    assert sorted(records) == ["Acme", "OldCo", "Undated"]
+    # Two listing pages plus one detail page per kept program; VDP Corp and Retired are never fetched.
+    assert standin.request_count == LISTING_PAGES + 3
+
+
+def test_keeps_only_accepted_scope_types(standin, tmp_path):
+    _, records = crawl(standin, tmp_path, QueryOptions())
+
+    acme = records["Acme"]
+    assert acme.wildcards == ["*.acme.com"]
+    assert acme.domains == ["https://www.acme.com", "api.acme.com"]
+    assert records["OldCo"].wildcards == ["*.oldco.net"]
+    assert records["Undated"].domains == ["https://app.undated.io"]
+    assert records["Undated"].wildcards == []
+
+
+def test_new_mode_drops_programs_launched_before_the_cutoff(standin, tmp_path):
+    options = QueryOptions(mode="new", cutoff=datetime(2026, 1, 1), interval_label="test")
+    _, records = crawl(standin, tmp_path, options)
+
+    assert sorted(records) == ["Acme", "Undated"]
+    # The listing has no date for Undated, so it comes from the detail page, converted to UTC.
+    assert records["Undated"].launched_at == datetime(2026, 10, 1, 10, 0)
+    # OldCo is dated in the listing and dropped before its detail page is requested.
+    assert standin.request_count == LISTING_PAGES + 2
+
+
+def test_personal_access_token_goes_in_x_auth_token():
+    client = YesWeHackClient({"client": {"cache": False, "state": False}})
+    try:
+        assert client._build_headers("pat-0123456789") == {"X-AUTH-TOKEN": "pat-0123456789"}
+        assert client._build_headers("aaa.bbb.ccc") == {"Authorization": "Bearer aaa.bbb.ccc"}
+    finally:
+        client.close()
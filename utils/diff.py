@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from config.constants import DEFAULT_MAX_MEMORY_MB
+from utils.extsort import sorted_unique
+from utils.models import ProgramRecord
+
+SNAPSHOT_RECORDS_BASENAME = "programs.json"
+
+
+@dataclass
+class ProgramChange:
+    platform: str
+    name: str
+    status: str  # new|removed|changed
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+def iter_sorted_unique(file_path: str, max_memory_mb: float | None = DEFAULT_MAX_MEMORY_MB) -> Iterator[str]:
+    """Yield the stripped, non-empty lines of a file in sorted order without duplicates."""
+    if not os.path.isfile(file_path):
+        return
+
+    with open(file_path, "r", encoding="utf-8", errors="replace") as file:
+        yield from sorted_unique((line.strip() for line in file if line.strip()), max_memory_mb)
+
+
+def merge_diff(old: Iterable[str], new: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Walk two sorted, duplicate-free streams once and yield ("+", item) / ("-", item) for every difference."""
+    old_iter, new_iter = iter(old), iter(new)
+    old_item, new_item = next(old_iter, None), next(new_iter, None)
+
+    while old_item is not None or new_item is not None:
+        if new_item is None or (old_item is not None and old_item < new_item):
+            yield "-", old_item
+            old_item = next(old_iter, None)
+        elif old_item is None or new_item < old_item:
+            yield "+", new_item
+            new_item = next(new_iter, None)
+        else:
+            old_item, new_item = next(old_iter, None), next(new_iter, None)
+
+
+def diff_files(
+    pairs: Iterable[tuple[str, str]],
+    added_file: str,
+    removed_file: str,
+    max_memory_mb: float | None = DEFAULT_MAX_MEMORY_MB,
+) -> tuple[int, int]:
+    """Diff each (old, new) file pair and write the added/removed lines; returns (added, removed) counts."""
+    added = removed = 0
+
+    with open(added_file, "w", encoding="utf-8") as added_handle, open(removed_file, "w", encoding="utf-8") as removed_handle:
+        for old_file, new_file in pairs:
+            for sign, item in merge_diff(iter_sorted_unique(old_file, max_memory_mb), iter_sorted_unique(new_file, max_memory_mb)):
+                if sign == "+":
+                    added_handle.write(item + "\n")
+                    added += 1
+                else:
+                    removed_handle.write(item + "\n")
+                    removed += 1
+
+    return added, removed
+
+
+def diff_records(old_records: Iterable[ProgramRecord], new_records: Iterable[ProgramRecord]) -> list[ProgramChange]:
+    """Compare program scopes by (platform, name) and return one ProgramChange per new, removed or changed program."""
+    old_by_key = {(r.platform, r.name): set(r.wildcards) | set(r.domains) for r in old_records}
+    new_by_key = {(r.platform, r.name): set(r.wildcards) | set(r.domains) for r in new_records}
+    changes = []
+
+    for key in sorted(old_by_key.keys() | new_by_key.keys()):
+        platform, name = key
+        old_assets = old_by_key.get(key)
+        new_assets = new_by_key.get(key)
+
+        if old_assets is None:
+            changes.append(ProgramChange(platform, name, "new", added=sorted(new_assets)))
+        elif new_assets is None:
+            changes.append(ProgramChange(platform, name, "removed", removed=sorted(old_assets)))
+        elif old_assets != new_assets:
+            changes.append(
+                ProgramChange(
+                    platform,
+                    name,
+                    "changed",
+                    added=sorted(new_assets - old_assets),
+                    removed=sorted(old_assets - new_assets),
+                )
+            )
+
+    return changes
+
+
+def load_snapshot_records(snapshot_dir: str) -> list[ProgramRecord] | None:
+    """Return the records saved with a snapshot, or None when there is no previous snapshot."""
+    path = os.path.join(snapshot_dir, SNAPSHOT_RECORDS_BASENAME)
+    if not os.path.isfile(path):
+        return None
+
+    with open(path, "r", encoding="utf-8") as file:
+        return [ProgramRecord.from_dict(item) for item in json.load(file)]
+
+
+def save_snapshot(snapshot_dir: str, files: Iterable[str], records: Iterable[ProgramRecord]) -> None:
+    """Replace the snapshot with copies of this run's output files and its program records."""
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    for file_path in files:
+        target = os.path.join(snapshot_dir, os.path.basename(file_path))
+        if os.path.isfile(file_path):
+            shutil.copyfile(file_path, target)
+        elif os.path.exists(target):
+            os.remove(target)
+
+    with open(os.path.join(snapshot_dir, SNAPSHOT_RECORDS_BASENAME), "w", encoding="utf-8") as file:
+        json.dump([record.to_dict() for record in records], file)
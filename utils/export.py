@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+
+from utils.models import ProgramRecord
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+SCOPE_COLUMNS = ("platform", "program", "launched_at", "asset", "asset_type")
+ROW_GROUP_SIZE = 50_000
+
+
+def columnar_extension() -> str:
+    """File extension of the columnar export: Parquet when pyarrow is installed, else gzipped column groups."""
+    return ".parquet" if pq else ".columns.jsonl.gz"
+
+
+class _ParquetScopeWriter:
+    def __init__(self, path: str):
+        self._schema = pa.schema([(name, pa.string()) for name in SCOPE_COLUMNS])
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write_group(self, columns: dict[str, list]) -> None:
+        self._writer.write_table(pa.table(columns, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _ColumnGroupWriter:
+    """Pure-Python fallback: gzipped JSON lines, each one row group as {"columns": {name: [values]}}."""
+
+    def __init__(self, path: str):
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._file.write(json.dumps({"schema": list(SCOPE_COLUMNS)}) + "\n")
+
+    def write_group(self, columns: dict[str, list]) -> None:
+        self._file.write(json.dumps({"columns": columns}, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class RecordExporter:
+    """Stream ProgramRecords to newline-delimited JSON and, optionally, a one-row-per-asset columnar file.
+
+    `write` is thread-safe, so concurrently running platforms can share one exporter.
+    """
+
+    def __init__(self, jsonl_path: str, columnar_path: str | None = None):
+        self.jsonl_path = jsonl_path
+        self.columnar_path = columnar_path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._jsonl = open(jsonl_path, "w", encoding="utf-8")
+        self._columnar = None
+        self._columns: dict[str, list] = {name: [] for name in SCOPE_COLUMNS}
+
+        if columnar_path:
+            self._columnar = _ParquetScopeWriter(columnar_path) if pq else _ColumnGroupWriter(columnar_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, record: ProgramRecord) -> None:
+        data = record.to_dict()
+        line = json.dumps(data, separators=(",", ":")) + "\n"
+
+        with self._lock:
+            self._jsonl.write(line)
+            self.count += 1
+            if self._columnar:
+                self._append_rows(record, data["launched_at"])
+
+    def _append_rows(self, record: ProgramRecord, launched_at: str | None) -> None:
+        for asset_type, assets in (("wildcard", record.wildcards), ("domain", record.domains)):
+            for asset in assets:
+                self._columns["platform"].append(record.platform)
+                self._columns["program"].append(record.name)
+                self._columns["launched_at"].append(launched_at)
+                self._columns["asset"].append(asset)
+                self._columns["asset_type"].append(asset_type)
+
+        if len(self._columns["asset"]) >= ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._columns["asset"]:
+            self._columnar.write_group(self._columns)
+            self._columns = {name: [] for name in SCOPE_COLUMNS}
+
+    def close(self) -> None:
+        with self._lock:
+            self._jsonl.close()
+            if self._columnar:
+                self._flush()
+                self._columnar.close()
+                self._columnar = None
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import heapq
+import os
+import sys
+import tempfile
+from typing import IO, Iterable, Iterator
+
+from config.constants import DEFAULT_MAX_MEMORY_MB
+
+ENTRY_OVERHEAD = 64  # rough per-line cost of the chunk set on top of the string itself
+MAX_FAN_IN = 64  # runs merged at once; more runs are merged in several passes
+
+
+def _write_run(lines: Iterable[str]) -> IO[str]:
+    run = tempfile.TemporaryFile("w+", encoding="utf-8")
+    for line in lines:
+        run.write(line + "\n")
+    run.seek(0)
+    return run
+
+
+def _read_run(run: IO[str]) -> Iterator[str]:
+    for line in run:
+        yield line[:-1]
+
+
+def _merge_unique(streams: list[Iterator[str]]) -> Iterator[str]:
+    previous = None
+    for line in heapq.merge(*streams):
+        if line != previous:
+            yield line
+            previous = line
+
+
+def sorted_unique(lines: Iterable[str], max_memory_mb: float | None = DEFAULT_MAX_MEMORY_MB) -> Iterator[str]:
+    """Yield the distinct lines in sorted order, the same as iterating sorted(set(lines)).
+
+    Inputs that fit in max_memory_mb are sorted in memory. Larger ones are cut into sorted runs
+    in temporary files and k-way merged, so memory stays bounded by the budget. Lines must not
+    contain newlines.
+    """
+    budget = max_memory_mb * 1024 * 1024 if max_memory_mb else None
+    chunk: set[str] = set()
+    used = 0
+    runs: list[IO[str]] = []
+
+    try:
+        for line in lines:
+            if line in chunk:
+                continue
+            chunk.add(line)
+            used += sys.getsizeof(line) + ENTRY_OVERHEAD
+            if budget and used >= budget:
+                runs.append(_write_run(sorted(chunk)))
+                chunk = set()
+                used = 0
+
+        if not runs:
+            yield from sorted(chunk)
+            return
+
+        if chunk:
+            runs.append(_write_run(sorted(chunk)))
+            chunk = set()
+
+        while len(runs) > MAX_FAN_IN:
+            batch, runs = runs[:MAX_FAN_IN], runs[MAX_FAN_IN:]
+            runs.append(_write_run(_merge_unique([_read_run(run) for run in batch])))
+            for run in batch:
+                run.close()
+
+        yield from _merge_unique([_read_run(run) for run in runs])
+    finally:
+        for run in runs:
+            run.close()
+
+
+def write_sorted_unique(lines: Iterable[str], output_path: str, max_memory_mb: float | None = DEFAULT_MAX_MEMORY_MB) -> int:
+    """Write sorted_unique(lines) to output_path and return the line count.
+
+    The result goes to a temporary file that replaces output_path at the end, so `lines` may be
+    read from output_path itself.
+    """
+    tmp_path = output_path + ".tmp"
+    count = 0
+
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        for line in sorted_unique(lines, max_memory_mb):
+            file.write(line + "\n")
+            count += 1
+
+    os.replace(tmp_path, output_path)
+    return count
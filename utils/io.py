@@ -1,21 +1,14 @@
 from __future__ import annotations
 
+import shutil
 from pathlib import Path
 
 
-def read_lines_resilient(file_path: str) -> list[str]:
-    """Read text lines while tolerating mixed encodings and broken bytes."""
-    path = Path(file_path)
-    if not path.exists():
-        raise FileNotFoundError(f"File not found: {file_path}")
-
-    for encoding in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            with path.open("r", encoding=encoding) as file:
-                return file.readlines()
-        except UnicodeDecodeError:
-            continue
-
-    # Final fallback: never fail on decode.
-    with path.open("r", encoding="utf-8", errors="replace") as file:
-        return file.readlines()
+def concatenate_files(sources: list[str], target: str) -> None:
+    """Write the contents of every existing source file, in order, to target."""
+    with open(target, "wb") as out:
+        for source in sources:
+            if not Path(source).is_file():
+                continue
+            with open(source, "rb") as src:
+                shutil.copyfileobj(src, out)
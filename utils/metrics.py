@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGE_BUCKETS = (0.1, 1.0, 10.0, 60.0, 300.0, 900.0, 3600.0)
+PROMETHEUS_PREFIX = "scraper_"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _label_text(labels: Labels) -> str:
+    return ",".join(f"{name}={value}" for name, value in labels)
+
+
+def _prometheus_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        total, result = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "buckets": {str(bound): count for bound, count in self.cumulative()},
+        }
+
+
+class Metrics:
+    """Thread-safe labelled counters and histograms for one crawl (or one process).
+
+    Everything recorded is forwarded to `parent` as well, so a per-run registry can feed the
+    process-wide one that the Prometheus endpoint serves.
+    """
+
+    def __init__(self, parent: Metrics | None = None):
+        self.parent = parent
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+        if self.parent:
+            self.parent.inc(name, value, **labels)
+
+    def observe(self, name: str, value: float, buckets: tuple[float, ...] = LATENCY_BUCKETS, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+        if self.parent:
+            self.parent.observe(name, value, buckets, **labels)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a pipeline stage into the stage_seconds histogram, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - started, STAGE_BUCKETS, stage=name)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {
+                name: {_label_text(labels): value for labels, value in sorted(series.items())}
+                for name, series in sorted(self._counters.items())
+            }
+            histograms = {
+                name: {_label_text(labels): histogram.to_dict() for labels, histogram in sorted(series.items())}
+                for name, series in sorted(self._histograms.items())
+            }
+
+        finished_at = time.time()
+        return {
+            "started_at": self.started_at,
+            "finished_at": finished_at,
+            "duration_seconds": round(finished_at - self.started_at, 3),
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    def write_json(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.snapshot(), handle, indent=2)
+            handle.write("\n")
+
+    def prometheus_text(self) -> str:
+        """Render every series in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = PROMETHEUS_PREFIX + name
+                lines.append(f"# TYPE {metric} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{metric}{_prometheus_labels(labels)} {value:g}")
+
+            for name, series in sorted(self._histograms.items()):
+                metric = PROMETHEUS_PREFIX + name
+                lines.append(f"# TYPE {metric} histogram")
+                for labels, histogram in sorted(series.items()):
+                    for bound, count in histogram.cumulative():
+                        lines.append(f"{metric}_bucket{_prometheus_labels(labels, ('le', f'{bound:g}'))} {count}")
+                    lines.append(f"{metric}_bucket{_prometheus_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{metric}_sum{_prometheus_labels(labels)} {histogram.sum:g}")
+                    lines.append(f"{metric}_count{_prometheus_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+PROCESS_METRICS = Metrics()
+
+
+def parse_listen_address(value: str) -> tuple[str, int]:
+    """Parse "[HOST:]PORT"; the host defaults to 127.0.0.1."""
+    host, _, port = value.rpartition(":")
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"Invalid listen address: {value!r} (expected [HOST:]PORT)")
+    return host or "127.0.0.1", int(port)
+
+
+def serve_prometheus(host: str, port: int, metrics: Metrics = PROCESS_METRICS) -> ThreadingHTTPServer:
+    """Serve metrics.prometheus_text() on http://host:port/metrics from a background thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    print(f"Prometheus metrics served on http://{host}:{port}/metrics")
+    return server
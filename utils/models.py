@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from utils.psl import apex_of
+
 
 @dataclass
 class QueryOptions:
@@ -11,10 +14,52 @@ class QueryOptions:
     interval_label: str = "all"
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgramRecord:
     platform: str
     name: str
     launched_at: datetime | None
     wildcards: list[str] = field(default_factory=list)
     domains: list[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        # Interned so the same asset held by several records, sinks and sets is stored once.
+        self.platform = sys.intern(self.platform)
+        self.name = sys.intern(self.name)
+        self.wildcards = [sys.intern(value) for value in self.wildcards]
+        self.domains = [sys.intern(value) for value in self.domains]
+
+    def add_wildcard(self, value: str) -> None:
+        self.wildcards.append(sys.intern(value))
+
+    def add_domain(self, value: str) -> None:
+        self.domains.append(sys.intern(value))
+
+    @property
+    def apexes(self) -> list[str]:
+        """Sorted registrable domains (eTLD+1) of this program's wildcards and domains."""
+        apexes = {apex_of(value) for value in self.wildcards}
+        apexes.update(apex_of(value) for value in self.domains)
+        apexes.discard(None)
+        return sorted(apexes)
+
+    def to_dict(self) -> dict:
+        return {
+            "platform": self.platform,
+            "name": self.name,
+            "launched_at": self.launched_at.isoformat() if self.launched_at else None,
+            "wildcards": list(self.wildcards),
+            "domains": list(self.domains),
+            "apexes": self.apexes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ProgramRecord:
+        launched_at = data.get("launched_at")
+        return cls(
+            platform=data["platform"],
+            name=data["name"],
+            launched_at=datetime.fromisoformat(launched_at) if launched_at else None,
+            wildcards=list(data.get("wildcards") or []),
+            domains=list(data.get("domains") or []),
+        )
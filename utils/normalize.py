@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+DEFAULT_SCHEME = "https"
+DEFAULT_PORTS = {"http": 80, "https": 443, "ws": 80, "wss": 443, "ftp": 21}
+NORMALIZE_CACHE_SIZE = 1 << 16  # scope targets repeat a lot across programs, pages and post-processing
+
+SCHEME_NAME_RE = re.compile(r"^[a-z][a-z0-9+.-]*$")
+HOST_RE = re.compile(r"^(?:[a-z0-9_*](?:[a-z0-9_*-]*[a-z0-9_*])?\.)*[a-z0-9_*](?:[a-z0-9_*-]*[a-z0-9_*])?$")
+IPV6_RE = re.compile(r"^\[[0-9a-f:.]+\]$")
+
+
+@dataclass(frozen=True, slots=True)
+class Target:
+    """A scope target parsed once: lowercased scheme, IDNA-lowercased host, non-default port, path and query.
+
+    scheme is None when the input had none; url() then renders the default scheme. Two inputs are the
+    same asset exactly when their url() is equal.
+    """
+
+    scheme: str | None
+    host: str
+    port: int | None
+    path: str
+    query: str
+
+    def url(self, default_scheme: str = DEFAULT_SCHEME) -> str:
+        port = f":{self.port}" if self.port is not None else ""
+        query = f"?{self.query}" if self.query else ""
+        return f"{self.scheme or default_scheme}://{self.host}{port}{self.path}{query}"
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def canonical_host(host: str) -> str:
+    """Lowercase, IDNA-encode and strip the trailing dot of a host name; "*" labels are kept as-is."""
+    host = host.strip().rstrip(".").lower()
+    if host.isascii():
+        return host
+    try:
+        labels = (label if "*" in label or label.isascii() else label.encode("idna").decode("ascii") for label in host.split("."))
+        return ".".join(labels)
+    except UnicodeError:
+        return host
+
+
+def _split_port(authority: str) -> tuple[str, int | None] | None:
+    if authority.startswith("["):
+        host, _, rest = authority.partition("]")
+        host += "]"
+        if not rest:
+            return host, None
+        if not rest.startswith(":"):
+            return None
+        port = rest[1:]
+    else:
+        host, colon, port = authority.rpartition(":")
+        if not colon:
+            return authority, None
+
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        return None
+    return host, int(port)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def parse_target(value: str) -> Target | None:
+    """Parse a URL or bare host ("Example.com", "https://example.com/", "http://[::1]:8080/x?y") into a Target.
+
+    Returns None for anything that is not a single host-based URL: blanks, whitespace inside,
+    wildcard hosts, malformed ports or characters that cannot appear in a host name.
+    """
+    text = value.strip()
+    if not text or any(char.isspace() for char in text):
+        return None
+
+    scheme = None
+    if "://" in text:
+        scheme, _, text = text.partition("://")
+        scheme = scheme.lower()
+        if not SCHEME_NAME_RE.match(scheme):
+            return None
+
+    text = text.partition("#")[0]
+    text, _, query = text.partition("?")
+    authority, slash, path = text.partition("/")
+    authority = authority.rpartition("@")[2]  # drop user:password@
+
+    split = _split_port(authority)
+    if split is None:
+        return None
+    host, port = split
+
+    host = canonical_host(host)
+    if not host or "*" in host or not (HOST_RE.match(host) or IPV6_RE.match(host)):
+        return None
+
+    if port is not None and DEFAULT_PORTS.get(scheme or DEFAULT_SCHEME) == port:
+        port = None
+    path = slash + path
+    if path == "/":
+        path = ""
+
+    return Target(scheme, host, port, path, query)
+
+
+def canonical_url(value: str, default_scheme: str = DEFAULT_SCHEME) -> str | None:
+    """Canonical URL string for value (https:// added when it has no scheme), or None when it does not parse."""
+    target = parse_target(value)
+    return target.url(default_scheme) if target else None
+
+
+def host_of(value: str) -> str:
+    """Canonical host of a URL, bare domain or wildcard: scheme, userinfo, port and path removed."""
+    start = value.find("://")
+    value = value[start + 3 :] if start != -1 else value
+    for separator in "/?#":
+        index = value.find(separator)
+        if index != -1:
+            value = value[:index]
+    value = value.rpartition("@")[2]
+    if value.startswith("["):
+        value = value.partition("]")[0] + "]"
+    else:
+        host, _, port = value.rpartition(":")
+        if host and port.isdigit():
+            value = host
+    return canonical_host(value)
+
+
+def canonical_wildcard(value: str) -> str:
+    """"*.Example.COM." and "https://*.example.com/" -> "*.example.com"; patterns inside labels are kept."""
+    text = value.strip()
+    if "://" in text:
+        text = text.partition("://")[2]
+    text = text.rstrip("/")
+    host, slash, path = text.partition("/")
+    return canonical_host(host) + slash + path
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import requests
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+def _chunks(lines: list[str], limit: int) -> list[str]:
+    chunks, current = [], ""
+    for line in lines:
+        line = line[:limit]
+        if current and len(current) + 1 + len(line) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def notify_discord(webhook_url: str | None, lines: list[str]) -> None:
+    """Post lines to a Discord webhook, split into messages under Discord's size limit. Failures are only logged."""
+    if not webhook_url or not lines:
+        return
+
+    for content in _chunks(lines, DISCORD_MESSAGE_LIMIT):
+        try:
+            response = requests.post(webhook_url, json={"content": content}, timeout=15)
+        except requests.RequestException as exc:
+            print(f"Discord notification failed: {exc}")
+            return
+        if response.status_code >= 400:
+            print(f"Discord notification failed with status {response.status_code}")
+            return
@@ -1,5 +1,14 @@
 import os
 import re
+import shutil
+
+from config.constants import DEFAULT_MAX_MEMORY_MB
+from utils.extsort import write_sorted_unique
+from utils.normalize import canonical_url, canonical_wildcard, host_of
+from utils.psl import apex_of
+from utils.suffix_index import WildcardIndex, collapse_wildcards
+
+SCHEME_RE = re.compile(r"^[a-zA-Z]+://")
 
 
 def create_trash_dir(trash_dir="domain_trash"):
@@ -15,107 +24,184 @@ def backup_original_file(original_file, trash_filename):
     base_dir = os.path.dirname(original_file) or "."
     trash_dir = os.path.join(base_dir, "domain_trash")
     create_trash_dir(trash_dir)
-    original_trash_path = os.path.join(trash_dir, trash_filename)
-
-    with open(original_file, "r", encoding="utf-8", errors="replace") as src_file:
-        original_content = src_file.read()
-    with open(original_trash_path, "w", encoding="utf-8") as backup_file:
-        backup_file.write(original_content)
-
-
-def clean_wildcards(wildcards_file, domains_file):
-    """Process wildcards, normalize them, and append eligible domains."""
-    if not os.path.isfile(wildcards_file):
-        print(f"{wildcards_file} does not exist. Skipping...")
-        return
-
-    backup_original_file(wildcards_file, "wildcards_original.txt")
-    cleaned_wildcards = []
-    domains_to_add = []
-
-    with open(wildcards_file, "r", encoding="utf-8", errors="replace") as file:
-        for line in file:
-            line = line.strip()
-            line = line.lstrip("*").lstrip(".").lstrip("-").strip()
-            if line.endswith("*"):
-                domains_to_add.append(line[:-1].strip())
-                continue
-            line = re.sub(r"^[a-zA-Z]+://", "", line)
-            if line and (line[0].isalpha() or line[0].isdigit()):
-                cleaned_wildcards.append(line)
-
-    with open(wildcards_file, "w", encoding="utf-8") as file:
-        for wildcard in cleaned_wildcards:
-            file.write(wildcard + "\n")
-
-    with open(domains_file, "a", encoding="utf-8") as file:
-        for domain in domains_to_add:
-            if domain:
-                file.write(domain + "\n")
-
-    print("Processed wildcards and saved additional domains.")
-
-
-def clean_invalid_urls(invalid_urls_file, domains_file):
-    """Clean invalid URLs and append probable domains."""
-    if not os.path.isfile(invalid_urls_file):
-        print(f"{invalid_urls_file} does not exist. Skipping...")
-        return
-
-    backup_original_file(invalid_urls_file, "invalid_urls_original.txt")
-    domains = []
-
-    with open(invalid_urls_file, "r", encoding="utf-8", errors="replace") as file:
-        for line in file:
-            line = line.strip()
-            if "." in line and " " not in line:
-                domains.append("https://" + line)
-
-    with open(domains_file, "a", encoding="utf-8") as file:
-        for domain in domains:
-            file.write(domain + "\n")
-
-    print("Processed invalid URLs and saved domains.")
+    shutil.copyfile(original_file, os.path.join(trash_dir, trash_filename))
 
 
-def add_https_to_domains(domains_file):
-    """Add https to domains that are missing protocol."""
-    if not os.path.isfile(domains_file):
-        print(f"{domains_file} does not exist. Skipping...")
+def iter_lines(file_path):
+    """Yield stripped lines of a file, or nothing when it does not exist."""
+    if not os.path.isfile(file_path):
         return
 
-    backup_original_file(domains_file, "domains_original.txt")
-    updated_domains = []
-
-    with open(domains_file, "r", encoding="utf-8", errors="replace") as file:
+    with open(file_path, "r", encoding="utf-8", errors="replace") as file:
         for line in file:
-            line = line.strip()
-            if not line:
-                continue
-            if not line.startswith("http://") and not line.startswith("https://"):
-                updated_domains.append(f"https://{line}")
-            else:
-                updated_domains.append(line)
-
-    with open(domains_file, "w", encoding="utf-8") as file:
-        for domain in updated_domains:
-            file.write(domain + "\n")
-
-    print("Updated domains with https protocol where missing.")
+            yield line.strip()
+
+
+def classify_wildcard(line):
+    """Normalize one wildcards.txt line into ("wildcard", value), ("domain", value) or (None, None) to drop it."""
+    # The scheme goes first, so "https://*.example.com" keeps its host.
+    line = SCHEME_RE.sub("", line.strip()).lstrip("*").lstrip(".").lstrip("-").strip()
+    if line.endswith("*"):
+        domain = line[:-1].strip()
+        return ("domain", domain) if domain else (None, None)
+
+    if line and (line[0].isalpha() or line[0].isdigit()):
+        return "wildcard", canonical_wildcard(line)
+    return None, None
+
+
+def invalid_url_to_domain(line):
+    """Return a probable https:// domain for an invalid_urls.txt line, or None."""
+    line = line.strip()
+    if "." in line and " " not in line:
+        return canonical_url(line) or "https://" + line
+    return None
+
+
+def ensure_https(domain):
+    """Canonical URL of domain (https:// when it has no scheme); unparsable input only gets the prefix."""
+    canonical = canonical_url(domain)
+    if canonical:
+        return canonical
+    if not domain.startswith("http://") and not domain.startswith("https://"):
+        return f"https://{domain}"
+    return domain
+
+
+def is_bare_url(domain):
+    """True for scheme://host[/] with no port, path or query: nothing a wildcard scan of host would miss."""
+    rest = domain.split("://", 1)[-1]
+    host, _, path = rest.partition("/")
+    return path == "" and not any(char in host for char in ":?#@")
+
+
+def apply_wildcard_coverage(wildcards, domains_file, covered_file, drop=False):
+    """Write "<domain> <wildcard>" to covered_file for every domain inside a wildcard's subdomains.
+
+    With drop, covered bare URLs (see is_bare_url) are removed from domains_file and nested or
+    duplicate wildcards are collapsed. Returns (wildcards to write, number of domains dropped).
+    """
+    index = WildcardIndex(wildcards)
+    covered = dropped = 0
+    temp_file = domains_file + ".tmp"
+    kept = open(temp_file, "w", encoding="utf-8") if drop else None
+
+    try:
+        with open(covered_file, "w", encoding="utf-8") as covered_handle:
+            for domain in iter_lines(domains_file):
+                wildcard = index.covering(host_of(domain)) if index.size else None
+                if wildcard:
+                    covered += 1
+                    covered_handle.write(f"{domain} {wildcard}\n")
+                    if drop and is_bare_url(domain):
+                        dropped += 1
+                        continue
+                if kept is not None:
+                    kept.write(domain + "\n")
+    finally:
+        if kept is not None:
+            kept.close()
+
+    if kept is not None:
+        os.replace(temp_file, domains_file)
+
+    if drop:
+        collapsed = collapse_wildcards(wildcards)
+        print(
+            f"Wildcard coverage: {covered} domains covered, {dropped} dropped; "
+            f"{len(wildcards) - len(collapsed)} nested/duplicate wildcards collapsed."
+        )
+        return collapsed, dropped
+
+    print(f"Wildcard coverage: {covered} domains already covered by a wildcard (see {covered_file}).")
+    return wildcards, dropped
+
+
+def write_apex_groups(wildcards, domains_file, apexes_file, counts_file):
+    """Group wildcards and domains by registrable domain (eTLD+1, see utils.psl).
+
+    apexes_file gets the sorted apexes, one per line; counts_file gets "<apex> <wildcards> <domains>"
+    lines, largest groups first. IPs and bare public suffixes have no apex and are skipped.
+    Returns the number of apexes.
+    """
+    counts = {}
+    for index, values in ((0, wildcards), (1, iter_lines(domains_file))):
+        for value in values:
+            apex = apex_of(value)
+            if apex:
+                counts.setdefault(apex, [0, 0])[index] += 1
+
+    with open(apexes_file, "w", encoding="utf-8") as file:
+        for apex in sorted(counts):
+            file.write(apex + "\n")
+
+    with open(counts_file, "w", encoding="utf-8") as file:
+        for apex, (wildcard_count, domain_count) in sorted(counts.items(), key=lambda item: (-sum(item[1]), item[0])):
+            file.write(f"{apex} {wildcard_count} {domain_count}\n")
+
+    print(f"Apex grouping: {len(counts)} registrable domains (see {apexes_file}, {counts_file}).")
+    return len(counts)
+
+
+def digest_outputs(
+    wildcards_file,
+    domains_file,
+    invalid_urls_file,
+    backups=True,
+    max_memory_mb=DEFAULT_MAX_MEMORY_MB,
+    covered_file=None,
+    drop_covered=False,
+    apexes_file=None,
+    apex_counts_file=None,
+):
+    """Clean wildcards, turn wildcard and invalid-URL leftovers into https:// domains, and dedupe the domains.
+
+    Each input is read once and each output written once. With backups, the untouched inputs are
+    copied to domain_trash/ first. Domains and wildcards are compared in canonical form (utils.normalize),
+    and domains are deduped within max_memory_mb, spilling to disk beyond it. With covered_file, domains inside a wildcard are listed there (and dropped with drop_covered).
+    With apexes_file and apex_counts_file, the results are also grouped by registrable domain.
+    """
+    if backups:
+        backup_original_file(wildcards_file, "wildcards_original.txt")
+        backup_original_file(invalid_urls_file, "invalid_urls_original.txt")
+        backup_original_file(domains_file, "domains_original.txt")
 
+    cleaned_wildcards = []
+    seen_wildcards = set()
+    had_domains_file = os.path.isfile(domains_file)
+
+    def iter_domains():
+        for line in iter_lines(domains_file):
+            if line:
+                yield ensure_https(line)
+
+        for line in iter_lines(wildcards_file):
+            kind, value = classify_wildcard(line)
+            if kind == "wildcard":
+                if value not in seen_wildcards:
+                    seen_wildcards.add(value)
+                    cleaned_wildcards.append(value)
+            elif kind == "domain":
+                yield ensure_https(value)
+
+        for line in iter_lines(invalid_urls_file):
+            domain = invalid_url_to_domain(line)
+            if domain:
+                yield domain
 
-def remove_duplicate_domains(domains_file):
-    """Remove duplicate lines from domains file."""
-    if not os.path.isfile(domains_file):
-        print(f"{domains_file} does not exist. Skipping...")
-        return
+    domain_count = write_sorted_unique(iter_domains(), domains_file, max_memory_mb)
+    if not domain_count and not had_domains_file:
+        os.remove(domains_file)
+    elif covered_file:
+        cleaned_wildcards, dropped = apply_wildcard_coverage(cleaned_wildcards, domains_file, covered_file, drop=drop_covered)
+        domain_count -= dropped
 
-    backup_original_file(domains_file, "domains_duplicates_original.txt")
-    with open(domains_file, "r", encoding="utf-8", errors="replace") as source_file:
-        unique_domains = sorted({line.strip() for line in source_file if line.strip()})
+    if os.path.isfile(wildcards_file):
+        with open(wildcards_file, "w", encoding="utf-8") as file:
+            for wildcard in cleaned_wildcards:
+                file.write(wildcard + "\n")
 
-    with open(domains_file, "w", encoding="utf-8") as file:
-        for domain in unique_domains:
-            file.write(domain + "\n")
+    if apexes_file and apex_counts_file:
+        write_apex_groups(cleaned_wildcards, domains_file, apexes_file, apex_counts_file)
 
-    print("Removed duplicate domains from the domains file.")
+    print(f"Processed outputs: {len(cleaned_wildcards)} wildcards, {domain_count} unique domains.")
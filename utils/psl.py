@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import threading
+from functools import lru_cache
+
+from config.constants import CACHE_DIRNAME, DATA_DIR
+from utils.normalize import canonical_host, host_of
+
+PSL_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "public_suffix_list.dat")
+PSL_CACHE_DIR = os.path.join(DATA_DIR, CACHE_DIRNAME)
+PSL_INDEX_FORMAT = 1
+APEX_CACHE_SIZE = 1 << 18
+
+
+class SuffixRules:
+    """The Public Suffix List as three sets of canonical suffixes: plain rules, "*." rules and "!" exceptions."""
+
+    def __init__(self, rules: set[str], wildcards: set[str], exceptions: set[str]):
+        self.rules = rules
+        self.wildcards = wildcards  # "*.ck" is stored as "ck"
+        self.exceptions = exceptions  # "!www.ck" is stored as "www.ck"
+
+    @classmethod
+    def parse(cls, lines) -> SuffixRules:
+        rules, wildcards, exceptions = set(), set(), set()
+        for line in lines:
+            rule = line.split("//", 1)[0].strip()
+            if not rule:
+                continue
+            if rule.startswith("!"):
+                exceptions.add(canonical_host(rule[1:]))
+            elif rule.startswith("*."):
+                wildcards.add(canonical_host(rule[2:]))
+            else:
+                rules.add(canonical_host(rule))
+        return cls(rules, wildcards, exceptions)
+
+    def public_suffix_length(self, labels: list[str]) -> int:
+        """Number of trailing labels forming the public suffix; unknown TLDs count as one (the implicit "*" rule)."""
+        length = 1
+        suffix = ""
+        for count in range(1, len(labels) + 1):
+            parent = suffix
+            suffix = labels[-count] + ("." + suffix if suffix else "")
+            if suffix in self.exceptions:
+                return count - 1
+            if suffix in self.rules or (parent and parent in self.wildcards):
+                length = count
+        return length
+
+
+def _load_index(source: str, cache_dir: str) -> SuffixRules:
+    """Parse the bundled list once, then reuse a marshal-compiled index keyed by the list's hash."""
+    with open(source, "rb") as handle:
+        raw = handle.read()
+
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+    index_path = os.path.join(cache_dir, f"psl-{PSL_INDEX_FORMAT}-{digest}.marshal")
+    try:
+        with open(index_path, "rb") as handle:
+            return SuffixRules(*marshal.load(handle))
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    rules = SuffixRules.parse(raw.decode("utf-8").splitlines())
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = index_path + ".tmp"
+        with open(temp_path, "wb") as handle:
+            marshal.dump((rules.rules, rules.wildcards, rules.exceptions), handle)
+        os.replace(temp_path, index_path)
+    except OSError as exc:
+        print(f"Could not cache the public suffix index at {index_path}: {exc}")
+    return rules
+
+
+_rules: SuffixRules | None = None
+_rules_lock = threading.Lock()
+
+
+def suffix_rules() -> SuffixRules:
+    """The bundled Public Suffix List, loaded on first use."""
+    global _rules
+    if _rules is None:
+        with _rules_lock:
+            if _rules is None:
+                _rules = _load_index(PSL_SOURCE, PSL_CACHE_DIR)
+    return _rules
+
+
+def _is_ip(host: str) -> bool:
+    return host.startswith("[") or host.replace(".", "").isdigit()
+
+
+@lru_cache(maxsize=APEX_CACHE_SIZE)
+def registrable_domain(host: str) -> str | None:
+    """eTLD+1 of a canonical host ("a.b.example.co.uk" -> "example.co.uk"); None for IPs and public suffixes."""
+    if not host or _is_ip(host):
+        return None
+    labels = host.split(".")
+    length = suffix_rules().public_suffix_length(labels)
+    if len(labels) <= length:
+        return None
+    return ".".join(labels[-length - 1 :])
+
+
+def apex_of(value: str) -> str | None:
+    """Registrable domain of a URL, bare domain or wildcard pattern (labels up to the last "*" are ignored)."""
+    host = host_of(value)
+    if "*" in host:
+        host = host.rpartition("*")[2].partition(".")[2]
+    return registrable_domain(host)
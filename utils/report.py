@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import glob
+import os
 from datetime import datetime
+from typing import Iterable, Iterator
 
+from utils.diff import ProgramChange
 from utils.models import ProgramRecord
 
+WRITE_BUFFER_SIZE = 1024 * 1024
+
 
 def _dedupe_keep_order(values: list[str]) -> list[str]:
     seen = set()
@@ -16,52 +21,139 @@ def _dedupe_keep_order(values: list[str]) -> list[str]:
     return result
 
 
-def write_programs_markdown(records: list[ProgramRecord], output_path: str) -> None:
-    dated: dict[str, list[ProgramRecord]] = defaultdict(list)
+def _changes_lines(changes: list[ProgramChange]) -> list[str]:
+    lines = ["## changes since last run", ""]
+
+    if not changes:
+        lines.append("- none")
+        lines.append("")
+        return lines
+
+    for change in changes:
+        lines.append(f"### {change.name} ({change.platform}) - {change.status}")
+        lines.append("")
+        for asset in change.added:
+            lines.append(f"- added: {asset}")
+        for asset in change.removed:
+            lines.append(f"- removed: {asset}")
+        lines.append("")
 
-    for record in records:
-        date_key = record.launched_at.strftime("%Y-%m-%d") if record.launched_at else "unknown"
-        dated[date_key].append(record)
+    return lines
 
-    def date_sort_key(item: tuple[str, list[ProgramRecord]]):
-        key, _ = item
-        if key == "unknown":
-            return datetime.min
-        return datetime.strptime(key, "%Y-%m-%d")
 
-    lines = ["# programs", ""]
+def _record_lines(record: ProgramRecord) -> list[str]:
+    lines = [f"### {record.name} ({record.platform})", ""]
 
-    for date_key, date_records in sorted(dated.items(), key=date_sort_key, reverse=True):
-        lines.append(f"## {date_key}")
+    for heading, values in (("wildcards", record.wildcards), ("domains", record.domains)):
+        lines.append(f"#### {heading}")
+        values = _dedupe_keep_order(values)
+        if values:
+            lines.extend(f"- {value}" for value in values)
+        else:
+            lines.append("- none")
         lines.append("")
 
-        date_records_sorted = sorted(
-            date_records,
-            key=lambda r: (r.launched_at or datetime.min, r.name.lower()),
-            reverse=True,
-        )
-
-        for record in date_records_sorted:
-            lines.append(f"### {record.name} ({record.platform})")
-            lines.append("")
-
-            lines.append("#### wildcards")
-            wildcards = _dedupe_keep_order(record.wildcards)
-            if wildcards:
-                for wildcard in wildcards:
-                    lines.append(f"- {wildcard}")
-            else:
-                lines.append("- none")
-            lines.append("")
-
-            lines.append("#### domains")
-            domains = _dedupe_keep_order(record.domains)
-            if domains:
-                for domain in domains:
-                    lines.append(f"- {domain}")
-            else:
-                lines.append("- none")
-            lines.append("")
-
-    with open(output_path, "w", encoding="utf-8") as file:
-        file.write("\n".join(lines).rstrip() + "\n")
+    return lines
+
+
+def _sort_key(record: ProgramRecord) -> tuple[datetime, str]:
+    return record.launched_at or datetime.min, record.name.lower()
+
+
+def iter_dated_records(records: Iterable[ProgramRecord]) -> Iterator[tuple[str, ProgramRecord]]:
+    """Yield (date_key, record) newest first; records of one date are adjacent."""
+    for record in sorted(records, key=_sort_key, reverse=True):
+        yield (record.launched_at.strftime("%Y-%m-%d") if record.launched_at else "unknown"), record
+
+
+def _part_path(output_path: str, part: int) -> str:
+    if part == 1:
+        return output_path
+    stem, ext = os.path.splitext(output_path)
+    return f"{stem}.{part}{ext}"
+
+
+class _MarkdownWriter:
+    """Buffered line writer that rolls over to numbered part files once max_bytes is exceeded.
+
+    Blank lines are held back until more content follows, so files never end in blank lines.
+    """
+
+    def __init__(self, output_path: str, max_bytes: int | None = None):
+        self.output_path = output_path
+        self.max_bytes = max_bytes
+        self.paths: list[str] = []
+        self._file = None
+        self._written = 0
+        self._pending_blanks = 0
+
+    def open_part(self) -> None:
+        self.close()
+        path = _part_path(self.output_path, len(self.paths) + 1)
+        self._file = open(path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE)
+        self.paths.append(path)
+        self._written = 0
+        self._pending_blanks = 0
+
+    @property
+    def full(self) -> bool:
+        return bool(self.max_bytes) and self._written >= self.max_bytes
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            if not line:
+                self._pending_blanks += 1
+                continue
+
+            text = "\n" * self._pending_blanks + line + "\n"
+            self._pending_blanks = 0
+            self._file.write(text)
+            if self.max_bytes:
+                self._written += len(text.encode("utf-8"))
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def write_programs_markdown(
+    records: Iterable[ProgramRecord],
+    output_path: str,
+    changes: list[ProgramChange] | None = None,
+    max_bytes: int | None = None,
+) -> list[str]:
+    """Stream the programs report to output_path, newest date first, and return the files written.
+
+    With max_bytes, the report continues in programs.2.md, programs.3.md, ... once a file exceeds
+    it; each part starts with the "# programs" title and repeats the current "## <date>" heading.
+    """
+    writer = _MarkdownWriter(output_path, max_bytes)
+    writer.open_part()
+
+    try:
+        writer.write_lines(["# programs", ""])
+        if changes is not None:
+            writer.write_lines(_changes_lines(changes))
+
+        current_date = None
+        for date_key, record in iter_dated_records(records):
+            if writer.full:
+                writer.open_part()
+                writer.write_lines([f"# programs (part {len(writer.paths)})", "", f"## {date_key}", ""])
+                current_date = date_key
+            elif date_key != current_date:
+                writer.write_lines([f"## {date_key}", ""])
+                current_date = date_key
+
+            writer.write_lines(_record_lines(record))
+    finally:
+        writer.close()
+
+    # Drop parts left over from an earlier, longer report in the same directory.
+    stem, ext = os.path.splitext(output_path)
+    for stale in glob.glob(glob.escape(stem) + ".*" + ext):
+        if stale not in writer.paths and os.path.splitext(stale)[0].rsplit(".", 1)[-1].isdigit():
+            os.remove(stale)
+
+    return writer.paths
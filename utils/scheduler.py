@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Callable
+
+DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)([smhd]?)$")
+DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+def parse_duration(value: str) -> float:
+    """Parse "90", "30s", "10m", "6h" or "1d" into seconds."""
+    match = DURATION_RE.match(value.strip().lower())
+    if not match or float(match.group(1)) <= 0:
+        raise ValueError(f"Invalid duration: {value!r} (expected e.g. 30s, 10m, 6h, 1d)")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    group: str  # jobs sharing a group run on one thread, one at a time (e.g. one platform client)
+    interval: float
+    run: Callable[[], None]
+    next_run: float = 0.0
+
+
+class Scheduler:
+    """Run jobs every `interval` seconds, one thread per group, until stop() is called.
+
+    A job is first run at start-up; its next run is due `interval` after the previous one started.
+    Missed runs are not queued up, and a job that raises is logged and rescheduled.
+    """
+
+    def __init__(self, jobs: list[ScheduledJob]):
+        self.jobs = jobs
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def _run_group(self, jobs: list[ScheduledJob]) -> None:
+        while not self._stop.is_set():
+            job = min(jobs, key=lambda j: j.next_run)
+            delay = job.next_run - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+                continue
+
+            started = time.monotonic()
+            print(f"[scheduler] running {job.name}")
+            try:
+                job.run()
+            except Exception as exc:
+                print(f"[scheduler] {job.name} failed: {exc}")
+                traceback.print_exc()
+
+            job.next_run = max(started + job.interval, time.monotonic())
+            print(f"[scheduler] {job.name} done in {time.monotonic() - started:.1f}s, next run in {job.next_run - time.monotonic():.0f}s")
+
+    def start(self) -> None:
+        groups: dict[str, list[ScheduledJob]] = {}
+        for job in self.jobs:
+            groups.setdefault(job.group, []).append(job)
+
+        for group, jobs in groups.items():
+            thread = threading.Thread(target=self._run_group, args=(jobs,), name=f"scheduler-{group}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def join(self, timeout: float | None = None) -> None:
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_forever(self) -> None:
+        """Start every group and block until interrupted (Ctrl+C / SIGINT)."""
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            print("[scheduler] stopping...")
+        finally:
+            self.stop()
+            self.join()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from utils.normalize import host_of
+
+_ROOT = ""  # key holding a node's wildcard root; DNS labels are never empty
+
+
+def wildcard_root(wildcard: str) -> tuple[str, bool]:
+    """Return (root, exact) for a cleaned wildcard.
+
+    "example.com" (from "*.example.com") matches proper subdomains of example.com. A pattern such as
+    "api-*.example.com" matches a subset of them, so its root is example.com with exact=False.
+    """
+    labels = host_of(wildcard).split(".")
+    starred = [index for index, label in enumerate(labels) if "*" in label]
+    if not starred:
+        return ".".join(labels), True
+    return ".".join(labels[starred[-1] + 1 :]), False
+
+
+class WildcardIndex:
+    """Reversed-label trie of wildcard roots, e.g. com -> example -> {"": "example.com"}.
+
+    `covering(host)` walks the host's labels from the TLD down, so a lookup costs O(labels)
+    no matter how many wildcards are indexed.
+    """
+
+    def __init__(self, wildcards: Iterable[str] = ()):
+        self._trie: dict = {}
+        self.size = 0
+        for wildcard in wildcards:
+            self.add(wildcard)
+
+    def add(self, wildcard: str) -> None:
+        root, exact = wildcard_root(wildcard)
+        if not exact or not root:
+            return  # patterns like api-*.example.com cover only part of their root
+
+        node = self._trie
+        for label in reversed(root.split(".")):
+            node = node.setdefault(label, {})
+        if _ROOT not in node:
+            node[_ROOT] = wildcard
+            self.size += 1
+
+    def _covering_root(self, labels: list[str]) -> str | None:
+        # Only proper subdomains of a root are covered: the root node itself is never checked.
+        node = self._trie
+        for label in reversed(labels[1:]):
+            node = node.get(label)
+            if node is None:
+                return None
+            if _ROOT in node:
+                return node[_ROOT]
+        return None
+
+    def covering(self, host: str) -> str | None:
+        """The wildcard whose root is a proper parent domain of host, or None."""
+        host = host_of(host)
+        return self._covering_root(host.split(".")) if host else None
+
+    def covering_wildcard(self, wildcard: str) -> str | None:
+        """Another indexed wildcard that matches every host this one matches, or None."""
+        root, exact = wildcard_root(wildcard)
+        if not root:
+            return None
+        labels = root.split(".")
+        if not exact:
+            # api-*.example.com is contained in *.example.com itself.
+            labels = ["*"] + labels
+        return self._covering_root(labels)
+
+
+def collapse_wildcards(wildcards: Iterable[str]) -> list[str]:
+    """Drop duplicates and wildcards nested inside another one (*.a.example.com under *.example.com), keeping order."""
+    wildcards = list(wildcards)
+    index = WildcardIndex(wildcards)
+    seen = set()
+    collapsed = []
+    for wildcard in wildcards:
+        key = host_of(wildcard)
+        if key in seen or index.covering_wildcard(wildcard):
+            continue
+        seen.add(key)
+        collapsed.append(wildcard)
+    return collapsed
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from utils.normalize import canonical_url, canonical_wildcard
+
+WILDCARD = "wildcard"
+VALID_URL = "valid"
+INVALID = "invalid"
+
+URL_RE = re.compile(
+    r"^(?:http|ftp|wss)s?://"
+    r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,20}\.?|[A-Z0-9-]{2,}\.?)|"
+    r"localhost|"
+    r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|"
+    r"\[?[A-F0-9]*:[A-F0-9:]+\]?)"
+    r"(?::\d+)?"
+    r"(?:/?|[/?]\S+)$",
+    re.IGNORECASE,
+)
+# Every string URL_RE accepts starts with one of these (compared lowercased).
+URL_PREFIXES = ("http://", "https://", "ftp://", "ftps://", "wss://", "wsss://")
+
+
+@dataclass
+class ClassifiedTargets:
+    wildcards: list[str] = field(default_factory=list)
+    valid_urls: list[str] = field(default_factory=list)
+    invalid_urls: list[str] = field(default_factory=list)
+
+
+def is_valid_url(url: str) -> bool:
+    # The prefix check rejects bare hosts without running the regex.
+    return url[:8].lower().startswith(URL_PREFIXES) and URL_RE.match(url) is not None
+
+
+def classify_target(target: str) -> str | None:
+    """Return WILDCARD, VALID_URL or INVALID for a scope target, or None for a blank line."""
+    target = target.strip()
+    if not target:
+        return None
+    if "*" in target:
+        return WILDCARD
+    if is_valid_url(target):
+        return VALID_URL
+    return INVALID
+
+
+def classify_targets(targets: Iterable[str]) -> ClassifiedTargets:
+    """Split a list or generator of targets into wildcards, valid URLs and invalid URLs, keeping input order."""
+    result = ClassifiedTargets()
+    match = URL_RE.match
+
+    for target in targets:
+        target = target.strip()
+        if not target:
+            continue
+        if "*" in target:
+            result.wildcards.append(target)
+        elif target[:8].lower().startswith(URL_PREFIXES) and match(target) is not None:
+            result.valid_urls.append(target)
+        else:
+            result.invalid_urls.append(target)
+
+    return result
+
+
+class TargetSink:
+    """Classify targets as they are discovered and append each new one to its output file.
+
+    Domains are written as canonical URLs and wildcards are compared in canonical form, so
+    "Example.com" and "https://example.com/" count once. Duplicates are dropped per output.
+    Without an invalid_urls_file, invalid targets go to the domains file. The optional audit file receives every raw line passed to `audit`.
+    """
+
+    def __init__(
+        self,
+        wildcards_file: str,
+        domains_file: str,
+        invalid_urls_file: str | None = None,
+        audit_file: str | None = None,
+    ):
+        self._paths = {WILDCARD: wildcards_file, VALID_URL: domains_file}
+        if invalid_urls_file:
+            self._paths[INVALID] = invalid_urls_file
+
+        self._handles = {kind: open(path, "w", encoding="utf-8") for kind, path in self._paths.items()}
+        self._seen: dict[str, set[str]] = {kind: set() for kind in self._paths}
+        self._audit = open(audit_file, "w", encoding="utf-8") if audit_file else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def audit(self, line: str) -> None:
+        if self._audit:
+            self._audit.write(line + "\n")
+
+    def add(self, target: str, kind: str | None = None) -> str | None:
+        """Write target to its sink unless already seen; kind overrides classification. Returns the kind used."""
+        target = target.strip()
+        kind = kind or classify_target(target)
+        if kind is None:
+            return None
+        if kind not in self._handles:
+            kind = VALID_URL
+
+        line = target
+        if kind == WILDCARD:
+            target = canonical_wildcard(target)
+        elif kind == VALID_URL:
+            line = target = canonical_url(target) or target
+
+        seen = self._seen[kind]
+        if target not in seen:
+            seen.add(sys.intern(target))
+            self._handles[kind].write(line + "\n")
+        return kind
+
+    def close(self) -> None:
+        for kind, label in ((WILDCARD, "Wildcards"), (INVALID, "Invalid URLs"), (VALID_URL, "Valid URLs")):
+            if self._seen.get(kind):
+                print(f"{label} saved to {self._paths[kind]} ({len(self._seen[kind])} found)")
+
+        for handle in self._handles.values():
+            handle.close()
+        if self._audit:
+            self._audit.close()